@@ -37,6 +37,13 @@ def render_item(type_, obj, autogen_context):
     return False
 
 
+def include_name(name, type_, parent_names):
+    """Skip FTS5 virtual tables and their shadow tables, they are managed by hand."""
+    if type_ == "table" and name is not None:
+        return not name.startswith(tables.FTS_TABLES)
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -57,6 +64,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         render_item=render_item,
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -82,6 +90,7 @@ def run_migrations_online() -> None:
             target_metadata=target_metadata,
             render_item=render_item,
             render_as_batch=True,
+            include_name=include_name,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,66 @@
+"""users full text search
+
+Revision ID: 70d39f27d165
+Revises: 9adbd2f8edb7
+Create Date: 2026-10-19 19:35:03.410010
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '70d39f27d165'
+down_revision: Union[str, None] = '9adbd2f8edb7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+    CREATE VIRTUAL TABLE users_fts USING fts5(
+        full_name, telegram_username,
+        content='users', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """
+    )
+    op.execute(
+        """
+    CREATE TRIGGER users_fts_insert AFTER INSERT ON users BEGIN
+        INSERT INTO users_fts(rowid, full_name, telegram_username)
+        VALUES (new.id, new.full_name, new.telegram_username);
+    END;
+    """
+    )
+    op.execute(
+        """
+    CREATE TRIGGER users_fts_delete AFTER DELETE ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, full_name, telegram_username)
+        VALUES ('delete', old.id, old.full_name, old.telegram_username);
+    END;
+    """
+    )
+    op.execute(
+        """
+    CREATE TRIGGER users_fts_update
+    AFTER UPDATE OF full_name, telegram_username ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, full_name, telegram_username)
+        VALUES ('delete', old.id, old.full_name, old.telegram_username);
+        INSERT INTO users_fts(rowid, full_name, telegram_username)
+        VALUES (new.id, new.full_name, new.telegram_username);
+    END;
+    """
+    )
+    # Index the users that already exist
+    op.execute("""INSERT INTO users_fts(users_fts) VALUES ('rebuild');""")
+
+
+def downgrade() -> None:
+    op.execute("""DROP TRIGGER IF EXISTS users_fts_update;""")
+    op.execute("""DROP TRIGGER IF EXISTS users_fts_delete;""")
+    op.execute("""DROP TRIGGER IF EXISTS users_fts_insert;""")
+    op.execute("""DROP TABLE IF EXISTS users_fts;""")
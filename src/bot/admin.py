@@ -0,0 +1,236 @@
+import json
+from datetime import datetime
+from fast_depends import Depends, inject
+from sqlalchemy.ext.asyncio import AsyncSession
+from telegram import InlineKeyboardMarkup, InputFile, Update
+
+from src.bot.common.audit import audit_page
+from src.bot.common.callback import CallbackButton, arbitrary_callback_query_handler
+from src.bot.common.context import ApplicationContext
+from src.bot.common.profiling import allocation_diff, deep_sizeof, profiler
+from src.bot.common.wrappers import command_handler
+from src.bot.extractors import CallbackQuery, load_admin, tx
+from src.db.backup import BackupInProgress, BackupStats
+from src.db.tables import AuditEvent, User
+
+import structlog
+
+log = structlog.getLogger()
+
+
+def format_backup_stats(stats: BackupStats) -> str:
+    lines = []
+    if stats.running:
+        lines.append(
+            f"Backup running: {stats.progress:.0%} of {stats.pages_total} pages, started {stats.started_at:%Y-%m-%d %H:%M:%S} UTC"
+        )
+    if stats.last_snapshot:
+        lines.append(
+            f"Last snapshot: {stats.last_snapshot.name}, {stats.last_size / 1024 / 1024:.1f} MiB in {stats.last_duration:.1f}s"
+        )
+    if stats.last_error:
+        lines.append(f"Last backup failed: {stats.last_error}")
+    lines.append(f"Backups: {stats.backups}, failures: {stats.failures}")
+    return "\n".join(lines)
+
+
+async def _backup_and_report(context: ApplicationContext, chat_id: int):
+    try:
+        await context.backup.run()
+    except BackupInProgress:
+        text = "A backup is already running"
+    except Exception as e:
+        text = f"Backup failed: {e}"
+    else:
+        text = format_backup_stats(context.backup.stats)
+    await context.bot.send_message(chat_id=chat_id, text=text)
+
+
+async def scheduled_backup(context: ApplicationContext):
+    """
+    JobQueue callback taking the periodic backups
+    """
+    try:
+        await context.backup.run()
+    except BackupInProgress:
+        log.info("Skipping scheduled backup, another one is running")
+    except Exception:
+        # Already logged and counted in the backup stats
+        pass
+
+
+@command_handler("backup")
+@inject
+async def backup(
+    update: Update,
+    context: ApplicationContext,
+    admin: User = Depends(load_admin),
+):
+    """
+    `/backup` takes a snapshot of the database in the background, `/backup status` reports progress
+    and the last snapshot.
+    """
+    if context.backup.running or (context.args and context.args[0] == "status"):
+        await update.effective_message.reply_text(format_backup_stats(context.backup.stats))
+        return
+    context.audit.record("backup_started", actor_id=admin.telegram_id)
+    context.application.create_task(
+        _backup_and_report(context, update.effective_chat.id), update=update
+    )
+    await update.effective_message.reply_text("Backup started")
+
+
+AUDIT_PAGE_SIZE = 20
+
+
+class OLDER_AUDIT_EVENTS(CallbackButton):
+    action: str | None = None
+    before: int
+
+
+def format_audit_events(events: list[AuditEvent]) -> str:
+    if not events:
+        return "No audit events"
+    lines = []
+    for event in events:
+        line = f"#{event.id} {event.created_at:%Y-%m-%d %H:%M:%S} {event.action} by {event.actor_id or 'bot'}"
+        if event.target_id is not None:
+            line += f" on {event.target_id}"
+        if event.data:
+            line += f" {json.dumps(event.data)}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _older_events_markup(events: list[AuditEvent], action: str | None) -> InlineKeyboardMarkup | None:
+    if len(events) < AUDIT_PAGE_SIZE:
+        return None
+    return OLDER_AUDIT_EVENTS(action=action, before=events[-1].id).to_keyboard(text="Older")
+
+
+@command_handler("audit")
+@inject
+async def audit(
+    update: Update,
+    context: ApplicationContext,
+    session: AsyncSession = Depends(tx),
+    admin: User = Depends(load_admin),
+):
+    """
+    `/audit [action]` shows the newest audit events, optionally only those of one action,
+    with a button to page back through older ones.
+    """
+    action = context.args[0] if context.args else None
+    events = await audit_page(session, action=action, limit=AUDIT_PAGE_SIZE)
+    await update.effective_message.reply_text(
+        format_audit_events(events), reply_markup=_older_events_markup(events, action)
+    )
+
+
+@arbitrary_callback_query_handler(OLDER_AUDIT_EVENTS, clear_callback_data=True)
+@inject
+async def audit_older(
+    update: Update,
+    context: ApplicationContext,
+    page: OLDER_AUDIT_EVENTS = CallbackQuery(OLDER_AUDIT_EVENTS),
+    session: AsyncSession = Depends(tx),
+    admin: User = Depends(load_admin),
+):
+    events = await audit_page(
+        session, action=page.action, before=page.before, limit=AUDIT_PAGE_SIZE
+    )
+    await update.effective_message.edit_text(
+        format_audit_events(events), reply_markup=_older_events_markup(events, page.action)
+    )
+
+
+def _seconds_arg(args: list[str] | None, *, default: float, maximum: float) -> float | None:
+    if not args:
+        return default
+    try:
+        seconds = float(args[0])
+    except ValueError:
+        return None
+    return seconds if 0 < seconds <= maximum else None
+
+
+async def _profile_and_send(context: ApplicationContext, chat_id: int, seconds: float):
+    collapsed, samples = await profiler.profile(seconds)
+    await context.bot.send_document(
+        chat_id=chat_id,
+        document=InputFile(
+            collapsed.encode(), filename=f"profile-{datetime.utcnow():%Y%m%d-%H%M%S}.collapsed"
+        ),
+        caption=f"{samples} samples over {seconds:g}s, open it with speedscope.app or flamegraph.pl",
+    )
+
+
+@command_handler("profile")
+@inject
+async def profile(
+    update: Update,
+    context: ApplicationContext,
+    admin: User = Depends(load_admin),
+):
+    """
+    `/profile [seconds]` samples the event loop for a while (10 seconds by default) and sends the
+    collapsed stacks as a file.
+    """
+    seconds = _seconds_arg(context.args, default=10, maximum=120)
+    if seconds is None:
+        await update.effective_message.reply_text("Usage: /profile [seconds up to 120]")
+        return
+    if profiler.running:
+        await update.effective_message.reply_text("A profile is already running")
+        return
+    context.audit.record("profile", actor_id=admin.telegram_id, seconds=seconds)
+    context.application.create_task(
+        _profile_and_send(context, update.effective_chat.id, seconds), update=update
+    )
+    await update.effective_message.reply_text(f"Profiling for {seconds:g}s")
+
+
+def format_memory_report(context: ApplicationContext, diff) -> str:
+    application = context.application
+    exclude = (application, application.bot)
+    user_data = list(application.user_data.values())
+    chat_data = list(application.chat_data.values())
+    lines = [
+        f"user_data: {len(user_data)} users, {deep_sizeof(user_data, exclude=exclude) / 1024:.1f} KiB",
+        f"chat_data: {len(chat_data)} chats, {deep_sizeof(chat_data, exclude=exclude) / 1024:.1f} KiB",
+    ]
+    if cache := application.bot.callback_data_cache:
+        lines.append(f"callback data cache: {deep_sizeof(cache, exclude=exclude) / 1024:.1f} KiB")
+    lines.append("Top allocations:")
+    for stat in diff:
+        frame = stat.traceback[0]
+        lines.append(
+            f"{stat.size_diff / 1024:+.1f} KiB ({stat.count_diff:+d} blocks) {frame.filename}:{frame.lineno}"
+        )
+    return "\n".join(lines)
+
+
+async def _inspect_memory_and_report(context: ApplicationContext, chat_id: int, seconds: float):
+    diff = await allocation_diff(seconds)
+    await context.bot.send_message(chat_id=chat_id, text=format_memory_report(context, diff))
+
+
+@command_handler("memory")
+@inject
+async def memory(
+    update: Update,
+    context: ApplicationContext,
+    admin: User = Depends(load_admin),
+):
+    """
+    `/memory [seconds]` traces allocations for a while (10 seconds by default) and reports the
+    lines that allocated the most, along with the size of the user, chat and callback data.
+    """
+    seconds = _seconds_arg(context.args, default=10, maximum=300)
+    if seconds is None:
+        await update.effective_message.reply_text("Usage: /memory [seconds up to 300]")
+        return
+    context.application.create_task(
+        _inspect_memory_and_report(context, update.effective_chat.id, seconds), update=update
+    )
+    await update.effective_message.reply_text(f"Tracing allocations for {seconds:g}s")
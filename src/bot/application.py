@@ -3,10 +3,20 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio.session import AsyncSession, async_sessionmaker
 from telegram import Update
 from telegram.ext import ApplicationBuilder, Application
+from src.bot.common.audit import AuditLog
 from src.bot.common.context import ApplicationContext, context_types
+from src.bot.common.deletion import DeletionQueue
+from src.bot.common.media import MediaCache
+from src.bot.common.profiling import SlowUpdateLog
+from src.bot.common.scheduler import scheduler
+from src.bot.common.throttle import FloodControl
+from src.bot.common.transport import build_get_updates_request, build_request, warm_up
 from src.bot.common.wrappers import command_handler, reply_exception
+from src.bot.admin import audit, audit_older, backup, memory, profile, scheduled_backup
 from src.bot.errors import handle_error
+from src.bot.inline import inline_user_search
 from src.bot.extractors import tx, load_user
+from src.db.backup import SQLiteBackup
 from src.db.config import create_engine
 from src.db.tables import User, UserRole
 from src.settings import Settings
@@ -59,6 +69,14 @@ async def set_role(
     if target_user := await session.scalar(
         select(User).where(User.telegram_id == target_user_id)
     ):
+        context.audit.record_on_commit(
+            session,
+            "role_changed",
+            actor_id=user.telegram_id,
+            target_id=target_user_id,
+            old=target_user.role,
+            new=role,
+        )
         target_user.role = role
     else:
         await update.effective_message.reply_text("User not found")
@@ -83,6 +101,9 @@ async def start(
         log.warn("First admin detected", user=update.effective_user)
         user.role = UserRole.ADMIN
     session.add(user)
+    context.audit.record_on_commit(
+        session, "registered", actor_id=tg_user.id, role=user.role
+    )
 
 
 async def on_startup(app: Application):
@@ -97,6 +118,25 @@ async def on_startup(app: Application):
 
     app.bot_data._db = AsyncSessionLocal
     app.bot_data._settings = settings
+    app.bot_data._deletion_queue = DeletionQueue(app.bot)
+    app.bot_data._media = MediaCache(app.bot, AsyncSessionLocal)
+    app.bot_data._audit = AuditLog(AsyncSessionLocal)
+    app.bot_data._backup = SQLiteBackup(
+        db_path,
+        settings.BACKUP_DIR,
+        keep=settings.BACKUP_KEEP,
+        pages_per_step=settings.BACKUP_PAGES_PER_STEP,
+        step_sleep=settings.BACKUP_STEP_SLEEP,
+    )
+    if settings.BACKUP_INTERVAL:
+        app.job_queue.run_repeating(  # type: ignore
+            scheduled_backup,
+            interval=settings.BACKUP_INTERVAL,
+            first=settings.BACKUP_INTERVAL,
+            name="backup",
+        )
+    scheduler.start(app)
+    await warm_up(app.bot, 1 if settings.HTTP2 else settings.HTTP_WARM_CONNECTIONS)
 
     # Setup log forwarder to telegram
     # When sending to telegram just send the raw json logs in pretty format
@@ -126,14 +166,40 @@ async def on_startup(app: Application):
     logging.getLogger().addHandler(error_forwarder)
 
 
+async def on_stop(app: Application):
+    await app.bot_data._deletion_queue.shutdown()
+    await app.bot_data._audit.shutdown()
+
+
 application: Application = (
     ApplicationBuilder()
     .token(settings.BOT_TOKEN)
+    .request(build_request(settings))
+    .get_updates_request(build_get_updates_request(settings))
     .context_types(context_types)
     .arbitrary_callback_data(True)
+    .concurrent_updates(
+        SlowUpdateLog(
+            threshold=settings.SLOW_UPDATE_THRESHOLD,
+            summary_interval=settings.SLOW_UPDATE_SUMMARY_INTERVAL,
+        )
+    )
     .post_init(on_startup)
+    .post_stop(on_stop)
     .build()
 )
 
+# Runs before every other handler group, throttled updates never reach the handlers below
+flood_control = FloodControl(
+    rate=settings.THROTTLE_RATE,
+    burst=settings.THROTTLE_BURST,
+    costs={"start": 2, "role": 2},
+    # One inline query per keystroke, typing a name must not run the bucket dry
+    inline_query_cost=0.1,
+)
+
 application.add_error_handler(handle_error) # type: ignore
-application.add_handlers([start, set_role])
+application.add_handler(flood_control, group=-1)
+application.add_handlers(
+    [start, set_role, backup, audit, audit_older, profile, memory, inline_user_search]
+)
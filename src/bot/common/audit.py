@@ -0,0 +1,140 @@
+import asyncio
+from datetime import datetime
+from typing import Any
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.db.tables import AuditEvent
+
+import structlog
+
+log = structlog.getLogger()
+
+MAX_PENDING = 10_000
+"""
+Events kept in memory while the database is failing, the oldest are dropped beyond that
+"""
+
+
+class AuditLog:
+    """
+    Append-only audit log. `record` only buffers the event in memory, the buffer is appended to
+    the `audit_events` table in a single transaction `flush_interval` seconds after the first
+    pending event, or right away once `max_batch` events are pending.
+    Handlers never wait for the database, events are written in the order they were recorded.
+
+    ```
+    context.audit.record("role_changed", actor_id=admin.telegram_id, target_id=user_id, role="admin")
+    ```
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        flush_interval: float = 1.0,
+        max_batch: int = 500,
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending: list[dict[str, Any]] = []
+        self._flush_handle: asyncio.TimerHandle | asyncio.Handle | None = None
+        self._flushing: asyncio.Task | None = None
+        self._closed = False
+
+    def record(
+        self,
+        action: str,
+        *,
+        actor_id: int | None = None,
+        target_id: int | None = None,
+        **data: Any,
+    ):
+        self._pending.append(
+            {
+                "created_at": datetime.utcnow(),
+                "action": action,
+                "actor_id": actor_id,
+                "target_id": target_id,
+                "data": data or None,
+            }
+        )
+        loop = asyncio.get_running_loop()
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.flush_interval, self._start_flush)
+        elif len(self._pending) >= self.max_batch:
+            self._flush_handle.cancel()
+            self._flush_handle = loop.call_soon(self._start_flush)
+
+    def record_on_commit(self, session: AsyncSession, action: str, **kwargs: Any):
+        """
+        Records the event once `session` commits, for events describing changes made in it.
+        Nothing is recorded if the transaction is rolled back.
+        """
+        event.listen(
+            session.sync_session,
+            "after_commit",
+            lambda _: self.record(action, **kwargs),
+            once=True,
+        )
+
+    def _start_flush(self):
+        self._flush_handle = None
+        if self._flushing is None or self._flushing.done():
+            self._flushing = asyncio.create_task(self.flush())
+        else:
+            # A flush is still running, try again after another interval
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.flush_interval, self._start_flush
+            )
+
+    async def flush(self):
+        while self._pending:
+            batch = self._pending[: self.max_batch]
+            del self._pending[: self.max_batch]
+            try:
+                async with self.session_factory() as session:
+                    await session.execute(insert(AuditEvent), batch)
+                    await session.commit()
+            except Exception as e:
+                log.error("Failed writing audit events", events=len(batch), exc_info=e)
+                # Put them back in front, retried with the next flush
+                self._pending[:0] = batch
+                if len(self._pending) > MAX_PENDING:
+                    dropped = len(self._pending) - MAX_PENDING
+                    del self._pending[:dropped]
+                    log.error("Dropped audit events", events=dropped)
+                if self._flush_handle is None and not self._closed:
+                    self._flush_handle = asyncio.get_running_loop().call_later(
+                        self.flush_interval, self._start_flush
+                    )
+                return
+
+    async def shutdown(self):
+        self._closed = True
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flushing is not None:
+            await self._flushing
+        await self.flush()
+
+
+async def audit_page(
+    session: AsyncSession,
+    *,
+    action: str | None = None,
+    before: int | None = None,
+    limit: int = 20,
+) -> list[AuditEvent]:
+    """
+    Newest events first, keyset paginated: pass the id of the last event of a page as `before`
+    to get the next one.
+    """
+    query = select(AuditEvent).order_by(AuditEvent.id.desc()).limit(limit)
+    if action is not None:
+        query = query.where(AuditEvent.action == action)
+    if before is not None:
+        query = query.where(AuditEvent.id < before)
+    return list(await session.scalars(query))
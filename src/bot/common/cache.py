@@ -0,0 +1,51 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class LRUCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        self._entries.pop(key, None)
+
+
+class TTLCache(LRUCache):
+    """
+    `LRUCache` whose entries also expire `ttl` seconds after they were put
+    """
+
+    def __init__(self, max_entries: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        super().__init__(max_entries)
+        self.ttl = ttl
+        self.clock = clock
+
+    def get(self, key: Hashable) -> Any:
+        entry = super().get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < self.clock():
+            self.pop(key)
+            return None
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        super().put(key, (self.clock() + self.ttl, value))
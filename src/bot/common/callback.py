@@ -1,5 +1,7 @@
+import asyncio
 from functools import wraps
 from typing import (
+    Literal,
     Type,
     Optional,
     Pattern,
@@ -9,21 +11,51 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     CallbackQueryHandler,
 )
-from src.bot.common.context import ApplicationContext
+from src.bot.common.context import ApplicationContext, CallbackAnswer
 import structlog
 
 log = structlog.get_logger()
 
+LateAnswer = Literal["drop", "message"]
+
+
+async def _answer_callback_query(update: Update, answer: CallbackAnswer | None):
+    try:
+        if answer is None:
+            await update.callback_query.answer()  # type: ignore
+        else:
+            await update.callback_query.answer(  # type: ignore
+                text=answer.text, show_alert=answer.show_alert
+            )
+    except Exception as e:
+        log.error(f"Failed answering callback_query", error=e)
+
 
 def regex_callback_query_handler(
-    pattern: str | Pattern[str], *, answer_query_after: bool = True
+    pattern: str | Pattern[str],
+    *,
+    answer_query_after: bool = True,
+    answer_query_early: bool = False,
+    answer_grace: float = 0.0,
+    late_answer: LateAnswer = "drop",
 ):
     def inner_decorator(f) -> CallbackQueryHandler:
+        if answer_query_early:
+            return CallbackQueryHandler(
+                pattern=pattern,
+                callback=answer_inline_query_early(
+                    f, grace=answer_grace, late_answer=late_answer
+                ),
+            )
+
         @wraps(f)
         async def wrapped(update: Update, context: ApplicationContext):
             result = await f(update, context)
             if answer_query_after:
-                await update.callback_query.answer()  # type: ignore
+                answer = context.callback_answer or CallbackAnswer()
+                await update.callback_query.answer(  # type: ignore
+                    text=answer.text, show_alert=answer.show_alert
+                )
             return result
 
         return CallbackQueryHandler(pattern=pattern, callback=wrapped)  # type: ignore
@@ -35,16 +67,52 @@ def answer_inline_query_after(f):
     @wraps(f)
     async def wrapped(update: Update, context: ApplicationContext):
         result = await f(update, context)
-        try:
-            await update.callback_query.answer()  # type: ignore
-        except Exception as e:
-            log.error(f"Failed answering callback_query", error=e)
-        finally:
-            return result
+        await _answer_callback_query(update, context.callback_answer)
+        return result
 
     return wrapped
 
 
+def answer_inline_query_early(f=None, *, grace: float = 0.0, late_answer: LateAnswer = "drop"):
+    """
+    Answers the callback query concurrently with the handler instead of after it, so the
+    button's loading spinner stops right away.
+    If the handler sets `context.answer_callback(...)` within `grace` seconds, the toast/alert is
+    part of the answer. A callback query can only be answered once, an answer set after that is
+    dropped, or with `late_answer="message"` sent as a message to the chat if there is one
+    (buttons on inline mode messages have no chat).
+    """
+
+    def inner_decorator(f):
+        @wraps(f)
+        async def wrapped(update: Update, context: ApplicationContext):
+            handler = asyncio.ensure_future(f(update, context))
+            if grace:
+                await asyncio.wait({handler}, timeout=grace)
+            answer = context.callback_answer
+            ack = asyncio.ensure_future(_answer_callback_query(update, answer))
+            try:
+                result = await handler
+            finally:
+                await ack
+            late = context.callback_answer
+            if late is not answer and late is not None and late.text:
+                if late_answer == "message" and update.effective_chat is not None:
+                    await context.bot.send_message(
+                        chat_id=update.effective_chat.id, text=late.text
+                    )
+                else:
+                    log.debug("Dropping late callback query answer", text=late.text)
+            return result
+
+        return wrapped
+
+    if f is None:
+        return inner_decorator
+    else:
+        return inner_decorator(f)
+
+
 def drop_callback_data_after(f):
     @wraps(f)
     async def wrapped(update: Update, context: ApplicationContext):
@@ -65,10 +133,15 @@ def arbitrary_callback_query_handler(
     query_data_type: Type,
     *,
     answer_query_after: bool = True,
+    answer_query_early: bool = False,
+    answer_grace: float = 0.0,
+    late_answer: LateAnswer = "drop",
     clear_callback_data: bool = False,
 ):
     def inner_decorator(f) -> CallbackQueryHandler:
-        if answer_query_after:
+        if answer_query_early:
+            f = answer_inline_query_early(f, grace=answer_grace, late_answer=late_answer)
+        elif answer_query_after:
             f = answer_inline_query_after(f)
         if clear_callback_data:
             f = drop_callback_data_after(f)
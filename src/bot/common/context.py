@@ -1,4 +1,5 @@
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from typing import (
     TypeVar,
     Type,
@@ -12,6 +13,10 @@ from telegram.ext import (
 )
 import structlog
 
+from src.bot.common.audit import AuditLog
+from src.bot.common.deletion import DeletionQueue
+from src.bot.common.media import MediaCache
+from src.db.backup import SQLiteBackup
 from src.settings import Settings
 
 log = structlog.getLogger()
@@ -29,6 +34,22 @@ class BotData:
     """
     Application settings
     """
+    _deletion_queue: DeletionQueue
+    """
+    Batches message deletions, see `delete_message_after`
+    """
+    _media: MediaCache
+    """
+    Sends media by content, reusing the `file_id` of earlier uploads
+    """
+    _backup: SQLiteBackup
+    """
+    Online backups of the database
+    """
+    _audit: AuditLog
+    """
+    Buffered writer of the `audit_events` table
+    """
 
 
 class ChatData:
@@ -51,8 +72,26 @@ class UserData:
             del self._conversation_state[conversation_type]
 
 
+@dataclass(slots=True)
+class CallbackAnswer:
+    text: str | None = None
+    show_alert: bool = False
+
+
 class ApplicationContext(CallbackContext[ExtBot, UserData, ChatData, BotData]):
+    callback_answer: CallbackAnswer | None = None
+    """
+    Answer for the callback query currently being handled, see `answer_callback`
+    """
+
     # Define custom @property and utility methods here that interact with your context
+    def answer_callback(self, text: str | None = None, *, show_alert: bool = False):
+        """
+        Sets the toast/alert the callback decorators in `common/callback.py` answer the
+        current callback query with.
+        """
+        self.callback_answer = CallbackAnswer(text=text, show_alert=show_alert)
+
     @asynccontextmanager
     async def session(self):
         # If called by a User, check if the user has a SQL session already open
@@ -63,6 +102,22 @@ class ApplicationContext(CallbackContext[ExtBot, UserData, ChatData, BotData]):
     def settings(self) -> Settings:
         return self.bot_data._settings
 
+    @property
+    def deletion_queue(self) -> DeletionQueue:
+        return self.bot_data._deletion_queue
+
+    @property
+    def media(self) -> MediaCache:
+        return self.bot_data._media
+
+    @property
+    def backup(self) -> SQLiteBackup:
+        return self.bot_data._backup
+
+    @property
+    def audit(self) -> AuditLog:
+        return self.bot_data._audit
+
 
 context_types = ContextTypes(
     context=ApplicationContext, chat_data=ChatData, bot_data=BotData, user_data=UserData
@@ -1,8 +1,118 @@
+import inspect
 from dataclasses import dataclass, field
 from datetime import timedelta
 from typing import Any
 from telegram import Update
-from telegram.ext import BaseHandler, ConversationHandler
+from telegram.ext import Application, BaseHandler, ConversationHandler, Job
+
+from src.bot.common.context import ApplicationContext
+from src.bot.common.timing_wheel import Timer, TimingWheel
+
+import structlog
+
+log = structlog.getLogger()
+
+
+def _has_timeout_hooks() -> bool:
+    try:
+        schedule = inspect.signature(ConversationHandler._schedule_job)  # type: ignore
+        trigger = inspect.signature(ConversationHandler._trigger_timeout)  # type: ignore
+    except AttributeError:
+        return False
+    return list(schedule.parameters) == [
+        "self",
+        "new_state",
+        "application",
+        "update",
+        "context",
+        "conversation_key",
+    ] and list(trigger.parameters) == ["self", "context"]
+
+
+PTB_TIMEOUT_HOOKS = _has_timeout_hooks()
+"""
+Whether the installed python-telegram-bot has the private `ConversationHandler` methods
+`WheelConversationHandler` overrides, otherwise `ConversationBuilder` falls back to a plain
+`ConversationHandler`
+"""
+
+
+@dataclass(slots=True)
+class _TimeoutData:
+    """
+    What `ConversationHandler._trigger_timeout` reads from `context.job.data`
+    """
+
+    conversation_key: Any
+    update: Update
+    application: Application
+    callback_context: ApplicationContext
+
+
+@dataclass(slots=True)
+class _TimeoutContext:
+    """
+    Stands in for the callback context of a timeout job, `_trigger_timeout` only reads `job`
+    """
+
+    job: Timer
+
+
+class WheelConversationHandler(ConversationHandler):
+    """
+    `ConversationHandler` that keeps its `conversation_timeout` timers in a `TimingWheel` ticked by
+    a single repeating job, instead of scheduling one JobQueue job per conversation.
+    """
+
+    def __init__(self, *args, timeout_resolution: float = 1.0, **kwargs):
+        if not PTB_TIMEOUT_HOOKS:
+            raise RuntimeError(
+                "The installed python-telegram-bot is not compatible with WheelConversationHandler"
+            )
+        super().__init__(*args, **kwargs)
+        self.wheel = TimingWheel(resolution=timeout_resolution)
+        self._tick_job: Job | None = None
+        # Tracked here, `Job.enabled` starts out False on PTB 20.x even for running jobs
+        self._ticking = False
+
+    def _schedule_job(
+        self,
+        new_state: object,
+        application: Application,
+        update: Update,
+        context: ApplicationContext,
+        conversation_key,
+    ) -> None:
+        if new_state == self.END:
+            return
+        timeout = self.conversation_timeout
+        if isinstance(timeout, timedelta):
+            timeout = timeout.total_seconds()
+        self.timeout_jobs[conversation_key] = self.wheel.schedule(  # type: ignore
+            timeout,  # type: ignore
+            _TimeoutData(conversation_key, update, application, context),
+        )
+        # The tick job only runs while timers are pending
+        if self._tick_job is None:
+            self._tick_job = application.job_queue.run_repeating(  # type: ignore
+                self._expire_timeouts,
+                interval=self.wheel.resolution,
+                name=f"ConversationTimeouts:{self.name or id(self)}",
+            )
+        elif not self._ticking:
+            self._tick_job.enabled = True
+        self._ticking = True
+
+    async def _expire_timeouts(self, context: ApplicationContext):
+        for timer in self.wheel.expire():
+            # `_trigger_timeout` compares `context.job` with `timeout_jobs` by identity
+            context.application.create_task(
+                self._trigger_timeout(_TimeoutContext(job=timer)),  # type: ignore
+                name=f"ConversationTimeout:{timer.data.conversation_key}",
+            )
+        if len(self.wheel) == 0 and self._tick_job is not None:
+            self._tick_job.enabled = False
+            self._ticking = False
 
 
 @dataclass(slots=True)
@@ -14,6 +124,7 @@ class ConversationBuilder:
     name: str | None = None
     persistent: bool = False
     conversation_timeout: float | timedelta | None = None
+    timeout_resolution: float = 1.0
     map_to_parent: dict[object, object] | None = None
     states: dict = field(default_factory=dict)
     fallbacks: list = field(default_factory=list)
@@ -36,7 +147,22 @@ class ConversationBuilder:
             raise ValueError("Satet must be defined for ConversationHandler")
         if not self.entry_points:
             raise ValueError("Entry points must be defined for ConversationHandler")
-        return ConversationHandler(
+        if not PTB_TIMEOUT_HOOKS:
+            log.warning("Conversation timeouts fall back to one JobQueue job per conversation")
+            return ConversationHandler(
+                entry_points=self.entry_points,
+                states=self.states,
+                fallbacks=self.fallbacks,
+                per_user=self.per_user,
+                per_chat=self.per_chat,
+                per_message=self.per_message,
+                conversation_timeout=self.conversation_timeout,
+                allow_reentry=self.allow_reentry,
+                name=self.name,
+                persistent=self.persistent,
+                map_to_parent=self.map_to_parent,
+            )
+        return WheelConversationHandler(
             entry_points=self.entry_points,
             states=self.states,
             fallbacks=self.fallbacks,
@@ -48,4 +174,5 @@ class ConversationBuilder:
             name=self.name,
             persistent=self.persistent,
             map_to_parent=self.map_to_parent,
+            timeout_resolution=self.timeout_resolution,
         )
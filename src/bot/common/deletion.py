@@ -0,0 +1,74 @@
+import asyncio
+from telegram import Bot
+
+import structlog
+
+log = structlog.getLogger()
+
+MAX_BATCH = 100
+"""
+Maximum number of message ids accepted by `deleteMessages`
+"""
+
+
+class DeletionQueue:
+    """
+    Collects message ids per chat and deletes them through the bulk `deleteMessages` endpoint,
+    up to 100 ids per call, `debounce` seconds after the first pending deletion.
+    Flushes run in a background task and send one request at a time, so deletions never compete
+    with handlers for more than one connection.
+    Deletions still waiting for their `delay` when the bot shuts down are dropped.
+    """
+
+    def __init__(self, bot: Bot, *, debounce: float = 0.5):
+        self.bot = bot
+        self.debounce = debounce
+        self._pending: dict[int, set[int]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flushing: asyncio.Task | None = None
+        self._closed = False
+
+    def delete(self, chat_id: int, message_id: int, *, delay: float = 0):
+        loop = asyncio.get_running_loop()
+        if delay > 0:
+            loop.call_later(delay, self._delete_delayed, chat_id, message_id)
+            return
+        self._pending.setdefault(chat_id, set()).add(message_id)
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.debounce, self._start_flush)
+
+    def _delete_delayed(self, chat_id: int, message_id: int):
+        if not self._closed:
+            self.delete(chat_id, message_id)
+
+    def _start_flush(self):
+        self._flush_handle = None
+        if self._flushing is None or self._flushing.done():
+            self._flushing = asyncio.create_task(self.flush())
+        else:
+            # A flush is still running, try again after another debounce
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.debounce, self._start_flush
+            )
+
+    async def flush(self):
+        pending, self._pending = self._pending, {}
+        for chat_id, message_ids in pending.items():
+            ids = sorted(message_ids)
+            for i in range(0, len(ids), MAX_BATCH):
+                try:
+                    await self.bot.delete_messages(
+                        chat_id=chat_id, message_ids=ids[i : i + MAX_BATCH]
+                    )
+                except Exception as e:
+                    # Routine failures (not an admin, message too old) stay out of LOGGING_CHANNEL
+                    log.info("Failed deleting messages", chat_id=chat_id, error=e)
+
+    async def shutdown(self):
+        self._closed = True
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flushing is not None:
+            await self._flushing
+        await self.flush()
@@ -0,0 +1,211 @@
+import asyncio
+import hashlib
+import mmap
+import os
+from pathlib import Path
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from telegram import Bot, InputFile, Message
+from telegram.error import BadRequest
+
+from src.bot.common.cache import LRUCache
+from src.db.tables import MediaFile
+
+import structlog
+
+log = structlog.getLogger()
+
+MMAP_THRESHOLD = 1024 * 1024
+"""
+Files at least this big are hashed and uploaded through a memory map instead of being read
+into memory
+"""
+
+STALE_FILE_ID_ERRORS = ("wrong file identifier", "wrong remote file identifier", "file_id")
+"""
+Parts of the `BadRequest` messages Telegram answers a send with when the `file_id` itself is no
+longer usable, only these make the cache forget it and upload again
+"""
+
+
+class MappedFile:
+    """
+    Read-only file object over a memory map, httpx streams it into the multipart body chunk by
+    chunk and `fileno` lets it find out the length upfront.
+    """
+
+    def __init__(self, path: Path):
+        self._file = path.open("rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read(self, size: int = -1) -> bytes:
+        return self._map.read(size)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        self._map.seek(offset, whence)
+        return self._map.tell()
+
+    def tell(self) -> int:
+        return self._map.tell()
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+class MappedInputFile(InputFile):
+    __slots__ = ()
+
+    def __init__(self, file: MappedFile, filename: str):
+        super().__init__(b"", filename=filename)
+        self.input_file_content = file  # type: ignore
+
+
+def _hash_path(path: Path) -> str:
+    with path.open("rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return hashlib.sha256(m).hexdigest()
+
+
+class MediaCache:
+    """
+    Sends media by content: the first upload of some bytes stores the returned `file_id` in the
+    `media_files` table (with an in-memory LRU in front), every later send of the same bytes
+    reuses it, so it costs one small API call instead of an upload.
+
+    ```
+    await context.media.send_photo(chat_id, "resources/banner.png", caption="Welcome")
+    ```
+
+    Local files of at least `MMAP_THRESHOLD` bytes are hashed and uploaded through a memory map,
+    hashes of local files are cached by path, size and modification time.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        max_entries: int = 1024,
+    ):
+        self.bot = bot
+        self.session_factory = session_factory
+        self._file_ids = LRUCache(max_entries)
+        self._path_hashes = LRUCache(max_entries)
+
+    async def _digest(self, media: bytes | Path) -> tuple[str, int]:
+        if isinstance(media, bytes):
+            return hashlib.sha256(media).hexdigest(), len(media)
+        stat = media.stat()
+        key = (media, stat.st_mtime_ns, stat.st_size)
+        if digest := self._path_hashes.get(key):
+            return digest, stat.st_size
+        if stat.st_size >= MMAP_THRESHOLD:
+            digest = await asyncio.to_thread(_hash_path, media)
+        else:
+            digest = hashlib.sha256(media.read_bytes()).hexdigest()
+        self._path_hashes.put(key, digest)
+        return digest, stat.st_size
+
+    async def _lookup(self, key: tuple[str, str]) -> str | None:
+        if file_id := self._file_ids.get(key):
+            return file_id
+        async with self.session_factory() as session:
+            file_id = await session.scalar(
+                select(MediaFile.file_id).where(
+                    MediaFile.content_hash == key[0], MediaFile.kind == key[1]
+                )
+            )
+        if file_id:
+            self._file_ids.put(key, file_id)
+        return file_id
+
+    async def _forget(self, key: tuple[str, str]):
+        self._file_ids.pop(key)
+        async with self.session_factory() as session:
+            await session.execute(
+                delete(MediaFile).where(
+                    MediaFile.content_hash == key[0], MediaFile.kind == key[1]
+                )
+            )
+            await session.commit()
+
+    async def _store(self, key: tuple[str, str], file_id: str, size: int):
+        self._file_ids.put(key, file_id)
+        async with self.session_factory() as session:
+            await session.execute(
+                insert(MediaFile)
+                .values(content_hash=key[0], kind=key[1], file_id=file_id, size=size)
+                .on_conflict_do_nothing()
+            )
+            await session.commit()
+
+    async def send(
+        self,
+        kind: str,
+        chat_id: int | str,
+        media: bytes | str | Path,
+        *,
+        filename: str | None = None,
+        **kwargs,
+    ) -> Message:
+        """
+        Sends `media` (bytes or a local path) with `bot.send_<kind>`, e.g. `kind="photo"`.
+        Extra keyword arguments are passed to the send method.
+        """
+        if isinstance(media, str):
+            media = Path(media)
+        if isinstance(media, Path):
+            filename = filename or media.name
+        digest, size = await self._digest(media)
+        key = (digest, kind)
+        send = getattr(self.bot, f"send_{kind}")
+
+        if file_id := await self._lookup(key):
+            try:
+                return await send(chat_id, file_id, **kwargs)
+            except BadRequest as e:
+                if not any(part in e.message.lower() for part in STALE_FILE_ID_ERRORS):
+                    raise
+                log.warning("Cached file_id rejected, uploading again", kind=kind, error=e)
+                await self._forget(key)
+
+        mapped = None
+        if isinstance(media, bytes):
+            upload = InputFile(media, filename=filename)
+        elif size >= MMAP_THRESHOLD:
+            mapped = MappedFile(media)
+            upload = MappedInputFile(mapped, filename=filename or media.name)
+        else:
+            upload = InputFile(media.read_bytes(), filename=filename)
+        try:
+            message = await send(chat_id, upload, **kwargs)
+        finally:
+            if mapped:
+                mapped.close()
+
+        sent = message.photo[-1] if kind == "photo" else getattr(message, kind)
+        await self._store(key, sent.file_id, size)
+        return message
+
+    async def send_photo(self, chat_id: int | str, media: bytes | str | Path, **kwargs):
+        return await self.send("photo", chat_id, media, **kwargs)
+
+    async def send_document(self, chat_id: int | str, media: bytes | str | Path, **kwargs):
+        return await self.send("document", chat_id, media, **kwargs)
+
+    async def send_voice(self, chat_id: int | str, media: bytes | str | Path, **kwargs):
+        return await self.send("voice", chat_id, media, **kwargs)
+
+    async def send_audio(self, chat_id: int | str, media: bytes | str | Path, **kwargs):
+        return await self.send("audio", chat_id, media, **kwargs)
+
+    async def send_video(self, chat_id: int | str, media: bytes | str | Path, **kwargs):
+        return await self.send("video", chat_id, media, **kwargs)
+
+    async def send_animation(self, chat_id: int | str, media: bytes | str | Path, **kwargs):
+        return await self.send("animation", chat_id, media, **kwargs)
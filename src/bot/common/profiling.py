@@ -0,0 +1,221 @@
+import asyncio
+import gc
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from types import BuiltinFunctionType, FrameType, FunctionType, ModuleType
+from typing import Any, Awaitable, Callable, Iterable
+from telegram import Update
+from telegram.ext import SimpleUpdateProcessor
+
+import structlog
+
+log = structlog.getLogger()
+
+
+def _frame_label(frame: FrameType, labels: dict) -> str:
+    code = frame.f_code
+    label = labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        if "site-packages/" in filename:
+            filename = filename.rsplit("site-packages/", 1)[1]
+        label = f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ",")
+        labels[code] = label
+    return label
+
+
+class SamplingProfiler:
+    """
+    Statistical CPU profiler for the event loop thread: while profiling, a thread samples the
+    loop's stack every `interval` seconds. Nothing runs in between profiles.
+
+    The result is in collapsed stack format, one `outer;...;inner count` line per distinct stack,
+    which speedscope.app or `flamegraph.pl` turn into a flame graph.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def _sample(self, thread_id: int, seconds: float, stop: threading.Event) -> Counter[str]:
+        stacks: Counter[str] = Counter()
+        labels: dict = {}
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline and not stop.is_set():
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame, labels))
+                frame = frame.f_back
+            if stack:
+                stacks[";".join(reversed(stack))] += 1
+            stop.wait(self.interval)
+        return stacks
+
+    async def profile(self, seconds: float) -> tuple[str, int]:
+        """
+        Samples the running event loop for `seconds`, returns the collapsed stacks and the number
+        of samples taken
+        """
+        async with self._lock:
+            stop = threading.Event()
+            try:
+                stacks = await asyncio.to_thread(
+                    self._sample, threading.get_ident(), seconds, stop
+                )
+            finally:
+                # Ends the sampling thread early if the profile was cancelled
+                stop.set()
+        collapsed = "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+        return collapsed, sum(stacks.values())
+
+
+profiler = SamplingProfiler()
+
+
+def deep_sizeof(obj: Any, *, exclude: Iterable[Any] = ()) -> int:
+    """
+    Approximate memory used by `obj` and everything it references, each object counted once.
+    Classes, modules and functions are shared and not counted, neither is anything in `exclude`
+    or referenced only through it.
+    """
+    seen = {id(o) for o in exclude}
+    stack = [obj]
+    size = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(
+            o, (type, ModuleType, FunctionType, BuiltinFunctionType)
+        ):
+            continue
+        seen.add(id(o))
+        size += sys.getsizeof(o)
+        stack.extend(gc.get_referents(o))
+    return size
+
+
+_tracing_diffs = 0
+_started_tracing = False
+
+
+async def allocation_diff(
+    seconds: float, *, top: int = 10
+) -> list[tracemalloc.StatisticDiff]:
+    """
+    Biggest growths in allocated memory by source line over the next `seconds`. Tracing slows
+    every allocation down, it is only turned on for the duration unless it already was.
+    """
+    global _tracing_diffs, _started_tracing
+    if _tracing_diffs == 0:
+        _started_tracing = not tracemalloc.is_tracing()
+        if _started_tracing:
+            tracemalloc.start()
+    _tracing_diffs += 1
+    try:
+        before = tracemalloc.take_snapshot()
+        await asyncio.sleep(seconds)
+        after = tracemalloc.take_snapshot()
+    finally:
+        _tracing_diffs -= 1
+        # Overlapping diffs share tracing, the last one to finish stops it
+        if _tracing_diffs == 0 and _started_tracing:
+            tracemalloc.stop()
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+    return diff[:top]
+
+
+def update_label(update: object) -> str:
+    """
+    What an update is about, stands in for the handler in the slow update log
+    """
+    if not isinstance(update, Update):
+        return type(update).__name__
+    if update.callback_query is not None:
+        data = update.callback_query.data
+        return f"callback_query:{data[:32] if isinstance(data, str) else type(data).__name__}"
+    if update.message is not None and (update.message.text or "").startswith("/"):
+        return f"command:{update.message.text.split(maxsplit=1)[0]}"  # type: ignore
+    for kind in Update.ALL_TYPES:
+        if getattr(update, kind, None) is not None:
+            return str(kind)
+    return "update"
+
+
+class SlowUpdateLog(SimpleUpdateProcessor):
+    """
+    Update processor that times every update and logs the ones taking longer than `threshold`
+    seconds at info, costs two clock reads per update. Warnings reach the `LOGGING_CHANNEL`, so
+    slow updates are summed up in one warning at most every `summary_interval` seconds.
+    Pass it to `ApplicationBuilder.concurrent_updates`, `max_concurrent_updates=1` keeps updates
+    processed one at a time like the default processor.
+    """
+
+    __slots__ = (
+        "threshold",
+        "summary_interval",
+        "clock",
+        "slow_updates",
+        "_unreported",
+        "_slowest",
+        "_reported_at",
+    )
+
+    def __init__(
+        self,
+        max_concurrent_updates: int = 1,
+        *,
+        threshold: float = 1.0,
+        summary_interval: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(max_concurrent_updates)
+        self.threshold = threshold
+        self.summary_interval = summary_interval
+        self.clock = clock
+        self.slow_updates = 0
+        self._unreported = 0
+        self._slowest = ("", 0.0)
+        self._reported_at = float("-inf")
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]):
+        start = time.perf_counter()
+        try:
+            await coroutine
+        finally:
+            duration = time.perf_counter() - start
+            if duration >= self.threshold:
+                self._slow_update(update, duration)
+
+    def _slow_update(self, update: object, duration: float):
+        handled = update_label(update)
+        self.slow_updates += 1
+        self._unreported += 1
+        if duration > self._slowest[1]:
+            self._slowest = (handled, duration)
+        log.info(
+            "Slow update",
+            handled=handled,
+            duration=round(duration, 3),
+            update_id=getattr(update, "update_id", None),
+        )
+        now = self.clock()
+        if now - self._reported_at < self.summary_interval:
+            return
+        log.warning(
+            "Slow updates",
+            count=self._unreported,
+            slowest=self._slowest[0],
+            slowest_duration=round(self._slowest[1], 3),
+            total=self.slow_updates,
+        )
+        self._reported_at = now
+        self._unreported = 0
+        self._slowest = ("", 0.0)
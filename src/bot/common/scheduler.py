@@ -0,0 +1,181 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Callable, Coroutine
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from telegram.ext import Application, Job
+
+from src.bot.common.context import ApplicationContext
+from src.db.tables import ScheduledJob
+
+import structlog
+
+log = structlog.getLogger()
+
+JobCallback = Callable[[ApplicationContext, Any], Coroutine[Any, Any, Any]]
+
+
+def utcnow() -> datetime:
+    return datetime.utcnow()
+
+
+class JobScheduler:
+    """
+    Persistent job scheduler backed by the `scheduled_jobs` table, jobs survive restarts.
+
+    Due jobs are claimed in batches with a single `UPDATE ... RETURNING` on the `run_at` index,
+    claiming pushes `run_at` forward by `lease`, so a job whose run was interrupted (crash, restart)
+    is picked up again once the lease expires. After `max_attempts` failed runs a job is dropped.
+    Claimed jobs run in their own tasks, a slow job neither delays the next poll nor other jobs.
+
+    ```
+    @scheduler.job("remind")
+    async def remind(context: ApplicationContext, data: dict):
+        await context.bot.send_message(chat_id=data["chat_id"], text=data["text"])
+
+    await scheduler.schedule(session, "remind", timedelta(hours=1), {"chat_id": 1, "text": "Hi"})
+    ```
+    """
+
+    def __init__(
+        self,
+        *,
+        poll_interval: float = 1.0,
+        batch_size: int = 100,
+        lease: timedelta = timedelta(minutes=5),
+        max_attempts: int = 5,
+    ):
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self._callbacks: dict[str, JobCallback] = {}
+        self._poll_job: Job | None = None
+        self._running: set[asyncio.Task] = set()
+
+    def job(self, name: str | None = None):
+        """
+        Registers a job callback, `name` defaults to the function name
+        """
+
+        def decorator(f: JobCallback) -> JobCallback:
+            self._callbacks[name or f.__name__] = f
+            return f
+
+        return decorator
+
+    async def schedule(
+        self,
+        session: AsyncSession,
+        name: str,
+        when: datetime | timedelta,
+        data: Any = None,
+        *,
+        interval: timedelta | None = None,
+    ) -> ScheduledJob:
+        """
+        Adds a job to the given session, it is persisted when the session commits.
+        `when` is either an UTC datetime or a delay from now.
+        """
+        if name not in self._callbacks:
+            raise ValueError(f"No job registered with name {name}")
+        run_at = utcnow() + when if isinstance(when, timedelta) else when
+        job = ScheduledJob(
+            name=name,
+            run_at=run_at,
+            data=data,
+            interval=interval.total_seconds() if interval else None,
+        )
+        session.add(job)
+        return job
+
+    async def cancel(self, session: AsyncSession, job_id: int):
+        await session.execute(delete(ScheduledJob).where(ScheduledJob.id == job_id))
+
+    async def claim(self, session: AsyncSession, now: datetime):
+        due = (
+            select(ScheduledJob.id)
+            .where(ScheduledJob.run_at <= now)
+            .order_by(ScheduledJob.run_at)
+            .limit(self.batch_size)
+        )
+        result = await session.execute(
+            update(ScheduledJob)
+            .where(ScheduledJob.id.in_(due.scalar_subquery()))
+            .values(run_at=now + self.lease, attempts=ScheduledJob.attempts + 1)
+            .returning(
+                ScheduledJob.id,
+                ScheduledJob.name,
+                ScheduledJob.data,
+                ScheduledJob.interval,
+                ScheduledJob.attempts,
+            )
+        )
+        return result.all()
+
+    async def _run(self, context: ApplicationContext, name: str, data: Any) -> bool:
+        callback = self._callbacks.get(name)
+        if callback is None:
+            log.error("No callback registered for scheduled job", job=name)
+            return False
+        try:
+            await callback(context, data)
+            return True
+        except Exception as e:
+            log.error("Scheduled job failed", job=name, exc_info=e)
+            return False
+
+    async def _run_claimed(self, context: ApplicationContext, job: Any, claimed_at: datetime):
+        ok = await self._run(context, job.name, job.data)
+        async with context.session() as session:
+            if ok and job.interval is not None:
+                await session.execute(
+                    update(ScheduledJob)
+                    .where(ScheduledJob.id == job.id)
+                    .values(run_at=claimed_at + timedelta(seconds=job.interval), attempts=0)
+                )
+            elif ok or job.attempts >= self.max_attempts:
+                if not ok:
+                    log.error("Dropping scheduled job", job=job.name, attempts=job.attempts)
+                await session.execute(delete(ScheduledJob).where(ScheduledJob.id == job.id))
+            # A failed job keeps its lease and is retried once it runs out
+            await session.commit()
+
+    async def run_due(self, context: ApplicationContext):
+        """
+        JobQueue callback, claims every due job in batches until none are left and starts each
+        in its own task. Returns without waiting for them, the lease keeps them from being
+        claimed again while they run.
+        """
+        while True:
+            now = utcnow()
+            async with context.session() as session:
+                jobs = await self.claim(session, now)
+                await session.commit()
+
+            for job in jobs:
+                task = context.application.create_task(self._run_claimed(context, job, now))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+            if len(jobs) < self.batch_size:
+                return
+
+    async def wait(self):
+        """
+        Waits for the jobs started so far to finish
+        """
+        while self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    def start(self, application: Application):
+        """
+        Polls the table on a single repeating JobQueue job
+        """
+        if self._poll_job is None:
+            self._poll_job = application.job_queue.run_repeating(  # type: ignore
+                self.run_due, interval=self.poll_interval, first=0, name="JobScheduler"
+            )
+
+
+scheduler = JobScheduler()
@@ -0,0 +1,169 @@
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable
+from telegram import Update
+from telegram.ext import ApplicationHandlerStop, BaseHandler
+
+from src.bot.common.context import ApplicationContext
+
+import structlog
+
+log = structlog.getLogger()
+
+ThrottleKey = tuple[int, int]
+
+
+@dataclass(slots=True)
+class ThrottleStats:
+    allowed: int = 0
+    dropped: int = 0
+    notices: int = 0
+    evicted: int = 0
+    """
+    Buckets evicted because the table was full
+    """
+    dropped_by_command: Counter[str] = field(default_factory=Counter)
+    """
+    Dropped updates per command, callback and inline queries are counted as `callback_query`
+    and `inline_query`
+    """
+
+
+class _Bucket:
+    __slots__ = ("tokens", "stamp", "notified_at")
+
+    def __init__(self, tokens: float, stamp: float):
+        self.tokens = tokens
+        self.stamp = stamp
+        self.notified_at = float("-inf")
+
+
+class FloodControl(BaseHandler[Update, ApplicationContext]):
+    """
+    Token bucket throttle keyed by `(user_id, chat_id)`, meant to be registered in a group that
+    runs before every other handler:
+
+    ```
+    application.add_handler(FloodControl(rate=1, burst=5), group=-1)
+    ```
+
+    Every update costs 1 token unless a weight is configured in `costs` (by command name),
+    `callback_cost` or `inline_query_cost`, buckets refill at `rate` tokens per second up to `burst`.
+    Clients send an inline query for every keystroke, so they are best given a small cost (or 0).
+    Throttled updates are dropped directly in `check_update` by raising `ApplicationHandlerStop`,
+    so no context, DB session or handler is ever created for them.
+    If `notice` is set the user is told to slow down, at most once every `notice_interval` seconds.
+    Throttled inline queries are always answered with no results, otherwise the client keeps
+    waiting for them.
+
+    Buckets are kept in a dict in least recently used order, once `max_keys` is reached the least
+    recently used bucket is evicted. An evicted bucket has usually refilled completely anyway.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float,
+        burst: float,
+        costs: dict[str, float] | None = None,
+        callback_cost: float = 1.0,
+        inline_query_cost: float = 1.0,
+        max_keys: int = 100_000,
+        notice: str | None = "You are sending too many requests, slow down.",
+        notice_interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(self._send_notice)
+        self.rate = rate
+        self.burst = burst
+        self.costs = costs or {}
+        self.callback_cost = callback_cost
+        self.inline_query_cost = inline_query_cost
+        self.max_keys = max_keys
+        self.notice = notice
+        self.notice_interval = notice_interval
+        self.clock = clock
+        self.stats = ThrottleStats()
+        self._buckets: dict[ThrottleKey, _Bucket] = {}
+
+    def _command(self, update: Update) -> str | None:
+        if update.callback_query:
+            return "callback_query"
+        if update.inline_query:
+            return "inline_query"
+        message = update.effective_message
+        if message is None or not message.text or message.text[0] != "/":
+            return None
+        parts = message.text[1:].split(maxsplit=1)
+        if not parts:
+            return None
+        return parts[0].split("@", 1)[0].lower()
+
+    def _cost(self, command: str | None) -> float:
+        if command == "callback_query":
+            return self.callback_cost
+        if command == "inline_query":
+            return self.inline_query_cost
+        if command is None:
+            return 1.0
+        return self.costs.get(command, 1.0)
+
+    def check_update(self, update: object) -> bool | None:
+        if not isinstance(update, Update) or update.effective_user is None:
+            return None
+        user_id = update.effective_user.id
+        chat_id = update.effective_chat.id if update.effective_chat else user_id
+        key = (user_id, chat_id)
+        command = self._command(update)
+        cost = self._cost(command)
+        now = self.clock()
+
+        buckets = self._buckets
+        # Re-inserting keeps the dict in least recently used order
+        bucket = buckets.pop(key, None)
+        if bucket is None:
+            if len(buckets) >= self.max_keys:
+                del buckets[next(iter(buckets))]
+                self.stats.evicted += 1
+            bucket = _Bucket(self.burst, now)
+        else:
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.stamp) * self.rate)
+            bucket.stamp = now
+        buckets[key] = bucket
+
+        if bucket.tokens >= cost:
+            bucket.tokens -= cost
+            self.stats.allowed += 1
+            return None
+
+        self.stats.dropped += 1
+        self.stats.dropped_by_command[command or "message"] += 1
+        if command == "inline_query":
+            return True
+        if self.notice and now - bucket.notified_at >= self.notice_interval:
+            bucket.notified_at = now
+            return True
+        raise ApplicationHandlerStop
+
+    async def _send_notice(self, update: Update, context: ApplicationContext):
+        if update.inline_query:
+            try:
+                await update.inline_query.answer([], cache_time=0, is_personal=True)
+            except Exception as e:
+                log.error("Failed answering throttled inline query", error=e)
+            raise ApplicationHandlerStop
+        self.stats.notices += 1
+        log.info(
+            "Throttling user",
+            user_id=update.effective_user.id,
+            dropped=self.stats.dropped,
+        )
+        try:
+            if update.callback_query:
+                await update.callback_query.answer(self.notice)
+            elif update.effective_message:
+                await update.effective_message.reply_text(self.notice)  # type: ignore
+        except Exception as e:
+            log.error("Failed sending throttle notice", error=e)
+        raise ApplicationHandlerStop
@@ -0,0 +1,81 @@
+import math
+import time
+from typing import Any, Callable
+
+
+class Timer:
+    """
+    Handle for a timer scheduled on a `TimingWheel`. Mirrors the parts of `telegram.ext.Job`
+    that `ConversationHandler` uses (`data` and `schedule_removal`).
+    """
+
+    __slots__ = ("wheel", "deadline", "data")
+
+    def __init__(self, wheel: "TimingWheel", deadline: int, data: Any):
+        self.wheel = wheel
+        self.deadline = deadline
+        self.data = data
+
+    def schedule_removal(self):
+        self.wheel.cancel(self)
+
+
+class TimingWheel:
+    """
+    Hashed timing wheel: timers are placed in one of `slots` buckets by their deadline tick,
+    scheduling and cancelling are O(1) and a single periodic `expire()` call fires every timer
+    that is due, instead of one scheduler job per timer.
+    Timers further away than one revolution stay in their bucket until their round comes up.
+    Precision is `resolution` seconds.
+    """
+
+    def __init__(
+        self,
+        resolution: float = 1.0,
+        slots: int = 512,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.resolution = resolution
+        self.clock = clock
+        self._slots: list[set[Timer]] = [set() for _ in range(slots)]
+        self._start = clock()
+        self._tick = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _current_tick(self) -> int:
+        return int((self.clock() - self._start) / self.resolution)
+
+    def schedule(self, delay: float, data: Any = None) -> Timer:
+        deadline = self._current_tick() + max(1, math.ceil(delay / self.resolution))
+        timer = Timer(self, deadline, data)
+        self._slots[deadline % len(self._slots)].add(timer)
+        self._size += 1
+        return timer
+
+    def cancel(self, timer: Timer):
+        bucket = self._slots[timer.deadline % len(self._slots)]
+        if timer in bucket:
+            bucket.remove(timer)
+            self._size -= 1
+
+    def expire(self) -> list[Timer]:
+        """
+        Advances the wheel to the current time and returns the timers that are due
+        """
+        now = self._current_tick()
+        expired = []
+        # Never scan more than one revolution, every bucket is visited at most once
+        first = max(self._tick + 1, now - len(self._slots) + 1)
+        for tick in range(first, now + 1):
+            bucket = self._slots[tick % len(self._slots)]
+            if not bucket:
+                continue
+            due = [timer for timer in bucket if timer.deadline <= now]
+            bucket.difference_update(due)
+            expired.extend(due)
+        self._tick = max(self._tick, now)
+        self._size -= len(expired)
+        return expired
@@ -0,0 +1,71 @@
+import asyncio
+import httpx
+from telegram import Bot
+from telegram.request import HTTPXRequest
+
+from src.settings import TelegramSettings
+
+import structlog
+
+log = structlog.getLogger()
+
+
+class TunedHTTPXRequest(HTTPXRequest):
+    """
+    `HTTPXRequest` that also lets you configure how long idle connections are kept alive,
+    PTB's default uses httpx's 5 seconds which makes quiet bots reconnect on most sends.
+    """
+
+    def __init__(self, *, keepalive_expiry: float | None, **kwargs):
+        super().__init__(**kwargs)
+        pool_size = kwargs.get("connection_pool_size", 1)
+        self._client_kwargs["limits"] = httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._client = self._build_client()
+
+
+def build_request(settings: TelegramSettings) -> HTTPXRequest:
+    """
+    Pool used by every outgoing call except `get_updates`
+    """
+    return TunedHTTPXRequest(
+        connection_pool_size=settings.HTTP_POOL_SIZE,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        http_version="2" if settings.HTTP2 else "1.1",
+        connect_timeout=settings.HTTP_CONNECT_TIMEOUT,
+        read_timeout=settings.HTTP_READ_TIMEOUT,
+        write_timeout=settings.HTTP_WRITE_TIMEOUT,
+        pool_timeout=settings.HTTP_POOL_TIMEOUT,
+    )
+
+
+def build_get_updates_request(settings: TelegramSettings) -> HTTPXRequest:
+    """
+    Separate single connection for long polling, so a pending `get_updates` never takes a
+    connection away from handlers sending messages
+    """
+    return TunedHTTPXRequest(
+        connection_pool_size=1,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        http_version="2" if settings.HTTP2 else "1.1",
+        connect_timeout=settings.GET_UPDATES_CONNECT_TIMEOUT,
+        read_timeout=settings.GET_UPDATES_READ_TIMEOUT,
+        write_timeout=settings.HTTP_WRITE_TIMEOUT,
+        pool_timeout=settings.HTTP_POOL_TIMEOUT,
+    )
+
+
+async def warm_up(bot: Bot, connections: int):
+    """
+    Opens `connections` connections to the Bot API ahead of the first updates, by sending
+    that many concurrent `getMe` calls
+    """
+    results = await asyncio.gather(
+        *(bot.get_me() for _ in range(connections)), return_exceptions=True
+    )
+    failed = [r for r in results if isinstance(r, Exception)]
+    if failed:
+        log.warning("Failed warming up connections", failed=len(failed), error=failed[0])
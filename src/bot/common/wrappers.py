@@ -8,6 +8,7 @@ from typing import (
 from telegram import Update
 from telegram.ext import (
     CommandHandler,
+    InlineQueryHandler,
     MessageHandler,
     filters,
 )
@@ -44,18 +45,33 @@ def reply_exception(
         return inner_decorator(_f)
 
 
-def delete_message_after(f: Callable[[Update, ApplicationContext], Awaitable[Any]]):
-    @wraps(f)
-    async def wrapper(update: Update, context: ApplicationContext):
-        result = await f(update, context)
-        try:
-            await context.bot.delete_message(
-                message_id=update.effective_message.id, chat_id=update.effective_chat.id  # type: ignore
-            )
-        finally:
-            return result
+def delete_message_after(
+    _f: Callable[[Update, ApplicationContext], Awaitable[Any]] | None = None,
+    *,
+    delay: float = 0,
+) -> Any:
+    """
+    Deletes the handled message through the batching `context.deletion_queue` once the handler
+    finished, `delay` seconds later if given.
+    """
 
-    return wrapper
+    def inner_decorator(f: Callable[[Update, ApplicationContext], Awaitable[Any]]):
+        @wraps(f)
+        async def wrapper(update: Update, context: ApplicationContext):
+            result = await f(update, context)
+            try:
+                context.deletion_queue.delete(
+                    update.effective_chat.id, update.effective_message.id, delay=delay  # type: ignore
+                )
+            finally:
+                return result
+
+        return wrapper
+
+    if _f is None:
+        return inner_decorator
+    else:
+        return inner_decorator(_f)
 
 
 def command_handler(command: str | list[str], *, filters: BaseFilter = filters.ALL):
@@ -82,3 +98,7 @@ def message_handler(filters: BaseFilter):
 
 def any_message(f: Callable[[Update, ApplicationContext], Coroutine[Any, Any, Any]]):
     return MessageHandler(filters=filters.ALL, callback=f)
+
+
+def inline_query_handler(f: Callable[[Update, ApplicationContext], Coroutine[Any, Any, Any]]):
+    return InlineQueryHandler(callback=f)
@@ -8,6 +8,11 @@ log = structlog.get_logger()
 class UserNotRegistered(Exception):
     pass
 
+
+class Unauthorized(Exception):
+    pass
+
+
 async def handle_error(update: Update, context: ApplicationContext):
     e = context.error
     if not e:
@@ -18,6 +23,11 @@ async def handle_error(update: Update, context: ApplicationContext):
                 chat_id=update.effective_chat.id,
                 text="You are not registered. Please register first with /start",
             )
+        case Unauthorized():
+            await context.bot.send_message(
+                chat_id=update.effective_chat.id,
+                text="Unauthorized",
+            )
         case _:
             # Log out the Stacktrace for unhandled exceptions
             log.error("Unhandled exception", exc_info=e)
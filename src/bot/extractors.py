@@ -7,8 +7,8 @@ from src.bot.common.context import ApplicationContext
 
 import structlog
 
-from src.bot.errors import UserNotRegistered
-from src.db.tables import User
+from src.bot.errors import Unauthorized, UserNotRegistered
+from src.db.tables import User, UserRole
 
 log = structlog.get_logger()
 
@@ -85,3 +85,15 @@ async def load_user(update: Update, session = Depends(tx)) -> User:
 
 CurrentUser = Annotated[User, Depends(load_user)]
 
+
+async def load_admin(update: Update, user: User = Depends(load_user)) -> User:
+    """
+    Extractor for the current user, raises `Unauthorized` if the user is not an admin.
+    """
+    if user.role != UserRole.ADMIN:
+        log.warn("Unauthorized user tried admin command", user=user, text=update.effective_message.text)
+        raise Unauthorized
+    return user
+
+
+CurrentAdmin = Annotated[User, Depends(load_admin)]
@@ -0,0 +1,113 @@
+import re
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from telegram import (
+    InlineQueryResultArticle,
+    InlineQueryResultsButton,
+    InputTextMessageContent,
+    Update,
+)
+
+from src.bot.common.cache import TTLCache
+from src.bot.common.context import ApplicationContext
+from src.bot.common.wrappers import inline_query_handler
+from src.db.tables import User
+
+import structlog
+
+log = structlog.getLogger()
+
+PAGE_SIZE = 20
+CACHE_TIME = 30
+"""
+Seconds Telegram caches the results of a query on its side, also the lifetime of the server-side cache
+"""
+
+_results = TTLCache(max_entries=4096, ttl=CACHE_TIME)
+_registered = TTLCache(max_entries=10_000, ttl=300)
+
+_SEARCH_USERS = text(
+    """
+    SELECT rowid, full_name, telegram_username FROM users_fts
+    WHERE users_fts MATCH :match AND rowid > :after
+    ORDER BY rowid
+    LIMIT :limit
+    """
+)
+
+
+def fts_query(query: str) -> str | None:
+    """
+    Turns what the user typed into an FTS5 query where every word is a prefix match,
+    `"ali sm"` matches `Alice Smith`
+    """
+    words = re.findall(r"\w+", query.lower())
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+async def search_users(
+    session: AsyncSession, query: str, *, after: int = 0, limit: int = PAGE_SIZE
+):
+    """
+    Users matching `query` by `full_name` or `telegram_username`, ordered by id.
+    Pages are keyset paginated, pass the last id of the previous page as `after`.
+    """
+    match = fts_query(query)
+    if match is None:
+        return []
+    result = await session.execute(
+        _SEARCH_USERS, {"match": match, "after": after, "limit": limit}
+    )
+    return result.all()
+
+
+async def _is_registered(context: ApplicationContext, telegram_id: int) -> bool:
+    if _registered.get(telegram_id):
+        return True
+    async with context.session() as session:
+        registered = await session.scalar(
+            select(User.id).where(User.telegram_id == telegram_id)
+        )
+    if registered:
+        _registered.put(telegram_id, True)
+    return registered is not None
+
+
+@inline_query_handler
+async def inline_user_search(update: Update, context: ApplicationContext):
+    query = update.inline_query
+    if not await _is_registered(context, query.from_user.id):
+        await query.answer(
+            [],
+            cache_time=0,
+            is_personal=True,
+            button=InlineQueryResultsButton(text="Register first", start_parameter="register"),
+        )
+        return
+
+    match = fts_query(query.query)
+    after = int(query.offset) if query.offset.isdigit() else 0
+    key = (match, after)
+    page = _results.get(key)
+    if page is None:
+        async with context.session() as session:
+            page = await search_users(session, query.query, after=after)
+        _results.put(key, page)
+
+    await query.answer(
+        [
+            InlineQueryResultArticle(
+                id=str(user_id),
+                title=full_name or username or str(user_id),
+                description=f"@{username}" if username else None,
+                input_message_content=InputTextMessageContent(
+                    f"{full_name} (@{username})" if username else full_name
+                ),
+            )
+            for user_id, full_name, username in page
+        ],
+        cache_time=CACHE_TIME,
+        next_offset=str(page[-1][0]) if len(page) == PAGE_SIZE else "",
+    )
@@ -0,0 +1,182 @@
+import asyncio
+import gzip
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import structlog
+
+log = structlog.getLogger()
+
+
+class BackupInProgress(Exception):
+    pass
+
+
+def _lower_thread_priority():
+    # Only Linux has per thread nice values, the backup only gets CPU time the event loop leaves.
+    # Elsewhere this would renice the whole process, the bot included.
+    if sys.platform.startswith("linux"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except OSError:
+            pass
+
+
+@dataclass
+class BackupStats:
+    running: bool = False
+    pages_total: int = 0
+    pages_remaining: int = 0
+    started_at: datetime | None = None
+    backups: int = 0
+    failures: int = 0
+    last_snapshot: Path | None = None
+    last_size: int = 0
+    """
+    Compressed size of the last snapshot in bytes
+    """
+    last_duration: float = 0.0
+    last_error: str | None = None
+
+    @property
+    def progress(self) -> float:
+        if not self.pages_total:
+            return 0.0
+        return 1 - self.pages_remaining / self.pages_total
+
+
+class SQLiteBackup:
+    """
+    Online backup of the SQLite database while the bot keeps running, through SQLite's backup API.
+
+    The database is copied `pages_per_step` pages at a time on a low priority thread, sleeping
+    `step_sleep` seconds between steps, then compressed into a timestamped
+    `<db name>-<UTC timestamp>.db.gz` snapshot in `directory`. Only the newest `keep` snapshots
+    are kept. The uncompressed copy needs as much free space in `directory` as the database.
+
+    The whole copy runs in a single read transaction, so the snapshot is consistent and writes
+    of the bot never restart it. That only leaves writers unblocked in WAL mode, which
+    `create_engine` turns on.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        directory: str | Path,
+        *,
+        keep: int = 7,
+        pages_per_step: int = 256,
+        step_sleep: float = 0.005,
+        compress_level: int = 6,
+    ):
+        self.db_path = Path(db_path)
+        self.directory = Path(directory)
+        self.keep = keep
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+        self.compress_level = compress_level
+        self.stats = BackupStats()
+        self._lock = asyncio.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="backup", initializer=_lower_thread_priority
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def snapshots(self) -> list[Path]:
+        """
+        Existing snapshots, oldest first
+        """
+        return sorted(self.directory.glob(f"{self.db_path.stem}-*.db.gz"))
+
+    def _progress(self, status: int, remaining: int, total: int):
+        self.stats.pages_remaining = remaining
+        self.stats.pages_total = total
+        # sqlite3 only sleeps when a step finds the database locked, pause between steps here
+        if remaining and self.step_sleep:
+            time.sleep(self.step_sleep)
+
+    def _copy(self, target: Path):
+        source = sqlite3.connect(self.db_path, isolation_level=None)
+        destination = sqlite3.connect(target)
+        try:
+            if source.execute("PRAGMA journal_mode").fetchone()[0] != "wal":
+                log.warning("Database is not in WAL mode, the backup blocks writers")
+            # Steps reuse the open read transaction instead of starting one each, every step
+            # copies from the same snapshot
+            source.execute("BEGIN")
+            source.execute("SELECT count(*) FROM sqlite_master").fetchone()
+            source.backup(
+                destination,
+                pages=self.pages_per_step,
+                progress=self._progress,
+                sleep=self.step_sleep,
+            )
+            source.execute("COMMIT")
+        finally:
+            destination.close()
+            source.close()
+
+    def _compress(self, copy: Path, partial: Path, snapshot: Path):
+        with copy.open("rb") as src, gzip.open(partial, "wb", self.compress_level) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        partial.rename(snapshot)
+
+    def _prune(self):
+        for snapshot in self.snapshots()[: -self.keep]:
+            snapshot.unlink()
+
+    async def run(self) -> Path:
+        """
+        Takes a snapshot and returns its path, raises `BackupInProgress` if one is already running
+        """
+        if self.running:
+            raise BackupInProgress
+        async with self._lock:
+            stats = self.stats
+            stats.running = True
+            stats.pages_total = stats.pages_remaining = 0
+            stats.started_at = datetime.utcnow()
+            self.directory.mkdir(parents=True, exist_ok=True)
+            name = f"{self.db_path.stem}-{stats.started_at:%Y%m%d-%H%M%S-%f}"
+            copy = self.directory / f"{name}.db.tmp"
+            snapshot = self.directory / f"{name}.db.gz"
+            partial = self.directory / f"{name}.db.gz.partial"
+            start = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(self._executor, self._copy, copy)
+                await loop.run_in_executor(self._executor, self._compress, copy, partial, snapshot)
+                await loop.run_in_executor(self._executor, self._prune)
+            except Exception as e:
+                stats.failures += 1
+                stats.last_error = str(e)
+                log.error("Database backup failed", exc_info=e)
+                raise
+            finally:
+                copy.unlink(missing_ok=True)
+                partial.unlink(missing_ok=True)
+                stats.running = False
+                stats.last_duration = time.perf_counter() - start
+
+            stats.backups += 1
+            stats.last_error = None
+            stats.last_snapshot = snapshot
+            stats.last_size = snapshot.stat().st_size
+            log.info(
+                "Database backup finished",
+                snapshot=str(snapshot),
+                size=stats.last_size,
+                duration=round(stats.last_duration, 3),
+            )
+            return snapshot
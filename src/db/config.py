@@ -1,3 +1,4 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine
 import json
 import pydantic_core
@@ -8,6 +9,16 @@ def json_serializer(*args, **kwargs) -> str:
     """
     return json.dumps(*args, default=pydantic_core.to_jsonable_python, **kwargs)
 
+def _enable_wal(dbapi_connection, connection_record):
+    # Readers, like a running backup, don't block writers in WAL mode. The mode is stored in the
+    # database file, in-memory databases ignore it.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
 def create_engine(db_path: str):
     db_url = "sqlite+aiosqlite:///" + db_path
-    return create_async_engine(url=db_url, json_serializer=json_serializer)
+    engine = create_async_engine(url=db_url, json_serializer=json_serializer)
+    event.listen(engine.sync_engine, "connect", _enable_wal)
+    return engine
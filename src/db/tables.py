@@ -1,4 +1,6 @@
+from datetime import datetime
 from enum import Enum
+from typing import Any
 from pydantic import BaseModel
 from sqlalchemy.orm import DeclarativeBase, Mapped, MappedAsDataclass, mapped_column
 import sqlalchemy as sa
@@ -42,3 +44,107 @@ class User(Base):
     """
     role: Mapped[UserRole] = mapped_column(nullable=False, default=UserRole.USER)
     admin: Mapped[bool] = mapped_column(nullable=False, default=False)
+
+
+USERS_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+        full_name, telegram_username,
+        content='users', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_insert AFTER INSERT ON users BEGIN
+        INSERT INTO users_fts(rowid, full_name, telegram_username)
+        VALUES (new.id, new.full_name, new.telegram_username);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_delete AFTER DELETE ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, full_name, telegram_username)
+        VALUES ('delete', old.id, old.full_name, old.telegram_username);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_update
+    AFTER UPDATE OF full_name, telegram_username ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, full_name, telegram_username)
+        VALUES ('delete', old.id, old.full_name, old.telegram_username);
+        INSERT INTO users_fts(rowid, full_name, telegram_username)
+        VALUES (new.id, new.full_name, new.telegram_username);
+    END
+    """,
+    "INSERT INTO users_fts(users_fts) VALUES ('rebuild')",
+]
+"""
+External content FTS5 index over `users`, kept in sync by triggers.
+Created by a migration in production, the listeners below create it for `Base.metadata.create_all`
+"""
+
+FTS_TABLES = ("users_fts",)
+"""
+Virtual tables (and their shadow tables) that autogenerate must ignore
+"""
+
+for statement in USERS_FTS_DDL:
+    sa.event.listen(User.__table__, "after_create", sa.DDL(statement))
+sa.event.listen(User.__table__, "before_drop", sa.DDL("DROP TABLE IF EXISTS users_fts"))
+
+
+class ScheduledJob(Base):
+    __tablename__ = "scheduled_jobs"
+    id: Mapped[int] = mapped_column(primary_key=True, init=False)
+    name: Mapped[str] = mapped_column(nullable=False)
+    """
+    Name the job callback was registered with on the `JobScheduler`
+    """
+    run_at: Mapped[datetime] = mapped_column(nullable=False, index=True)
+    """
+    Next time (UTC) the job is due. While a job is running this holds the end of its lease
+    """
+    data: Mapped[Any] = mapped_column(sa.JSON, nullable=True, default=None)
+    interval: Mapped[float | None] = mapped_column(nullable=True, default=None)
+    """
+    Seconds between runs for recurring jobs, `None` for one-off jobs
+    """
+    attempts: Mapped[int] = mapped_column(nullable=False, default=0)
+
+
+class MediaFile(Base):
+    __tablename__ = "media_files"
+    __table_args__ = (sa.UniqueConstraint("content_hash", "kind"),)
+    id: Mapped[int] = mapped_column(primary_key=True, init=False)
+    content_hash: Mapped[str] = mapped_column(nullable=False)
+    """
+    Hex sha256 of the uploaded bytes
+    """
+    kind: Mapped[str] = mapped_column(nullable=False)
+    """
+    How the file was sent (`photo`, `document`, `voice`...), file ids are only valid for the same kind
+    """
+    file_id: Mapped[str] = mapped_column(nullable=False)
+    size: Mapped[int] = mapped_column(nullable=False)
+
+
+class AuditEvent(Base):
+    __tablename__ = "audit_events"
+    __table_args__ = (sa.Index("ix_audit_events_action_id", "action", "id"),)
+    id: Mapped[int] = mapped_column(primary_key=True, init=False)
+    created_at: Mapped[datetime] = mapped_column(nullable=False)
+    """
+    When the event was recorded (UTC), events are written in batches a little later
+    """
+    action: Mapped[str] = mapped_column(nullable=False)
+    """
+    What happened, e.g. `role_changed` or `registered`
+    """
+    actor_id: Mapped[int | None] = mapped_column(nullable=True, default=None)
+    """
+    Telegram id of the user who did it, `None` for the bot itself
+    """
+    target_id: Mapped[int | None] = mapped_column(nullable=True, default=None)
+    """
+    Telegram id of the user it was done to
+    """
+    data: Mapped[Any] = mapped_column(sa.JSON, nullable=True, default=None)
@@ -2,11 +2,75 @@ from pydantic_settings import BaseSettings
 
 class DBSettings(BaseSettings):
     DB_PATH: str = "template_app.db"
+    BACKUP_DIR: str = "backups"
+    """
+    Directory compressed snapshots of the database are written to
+    """
+    BACKUP_INTERVAL: float = 6 * 60 * 60
+    """
+    Seconds between automatic backups, 0 disables them
+    """
+    BACKUP_KEEP: int = 7
+    """
+    Number of snapshots kept, older ones are deleted
+    """
+    BACKUP_PAGES_PER_STEP: int = 256
+    """
+    Database pages copied per step of the online backup
+    """
+    BACKUP_STEP_SLEEP: float = 0.005
+    """
+    Seconds the backup pauses between steps, letting the bot's own connections take their locks
+    """
 
 class TelegramSettings(BaseSettings):
     BOT_TOKEN: str
     FIRST_ADMIN: int
     LOGGING_CHANNEL: int | None = None
+    THROTTLE_RATE: float = 1.0
+    """
+    Tokens per second refilled in every user's flood control bucket
+    """
+    THROTTLE_BURST: float = 5.0
+    """
+    Maximum number of updates a user can send in a burst before getting throttled
+    """
+    HTTP_POOL_SIZE: int = 64
+    """
+    Connections shared by outgoing calls, `get_updates` has its own connection
+    """
+    HTTP_KEEPALIVE_EXPIRY: float = 60.0
+    """
+    Seconds an idle connection is kept open
+    """
+    HTTP2: bool = False
+    """
+    Multiplex all outgoing calls over HTTP/2 connections
+    """
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 5.0
+    HTTP_WRITE_TIMEOUT: float = 5.0
+    HTTP_POOL_TIMEOUT: float = 1.0
+    """
+    Seconds a call waits for a free connection in the pool
+    """
+    HTTP_WARM_CONNECTIONS: int = 4
+    """
+    Connections opened at startup, ignored with HTTP/2 where one connection is enough
+    """
+    GET_UPDATES_CONNECT_TIMEOUT: float = 5.0
+    GET_UPDATES_READ_TIMEOUT: float = 5.0
+    """
+    Added on top of the long polling timeout
+    """
+    SLOW_UPDATE_THRESHOLD: float = 1.0
+    """
+    Seconds after which handling an update is logged as slow
+    """
+    SLOW_UPDATE_SUMMARY_INTERVAL: float = 5 * 60
+    """
+    Slow updates are logged at info, a warning counting them goes out at most once per interval
+    """
 
 class Settings(TelegramSettings, DBSettings):
     pass
@@ -0,0 +1,21 @@
+import pytest
+
+from tests.benchmarks.harness import BENCH_SAVE, Bench
+
+
+@pytest.fixture
+def bench(request) -> Bench:
+    return Bench(request.node.name)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if BENCH_SAVE and Bench.results:
+        Bench.save_baselines()
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not Bench.results:
+        return
+    terminalreporter.section("benchmarks")
+    for result in Bench.results:
+        terminalreporter.write_line(result.summary())
@@ -0,0 +1,76 @@
+import itertools
+import time
+
+from telegram import Bot, InlineKeyboardMarkup, Update
+
+_update_ids = itertools.count(1)
+_message_ids = itertools.count(1)
+
+
+def tg_user(user_id: int, username: str | None = "bench_user") -> dict:
+    return {
+        "id": user_id,
+        "is_bot": False,
+        "first_name": "Bench",
+        "last_name": "User",
+        "username": username,
+    }
+
+
+def command_update(bot: Bot, text: str, *, user_id: int, chat_id: int | None = None) -> Update:
+    """
+    Builds a private-chat message update whose first word is a bot command, e.g. `/role 1 admin`
+    """
+    command = text.split(maxsplit=1)[0]
+    data = {
+        "update_id": next(_update_ids),
+        "message": {
+            "message_id": next(_message_ids),
+            "date": int(time.time()),
+            "chat": {"id": chat_id or user_id, "type": "private"},
+            "from": tg_user(user_id),
+            "text": text,
+            "entities": [{"type": "bot_command", "offset": 0, "length": len(command)}],
+        },
+    }
+    return Update.de_json(data, bot)  # type: ignore
+
+
+def callback_update(bot: Bot, markup: InlineKeyboardMarkup, *, user_id: int) -> Update:
+    """
+    Builds a callback query update for a click on the first button of `markup`. The markup must
+    already have been processed by the bot's callback data cache, the arbitrary callback data is
+    resolved the same way the `Updater` does it.
+    """
+    button = markup.inline_keyboard[0][0]
+    data = {
+        "update_id": next(_update_ids),
+        "callback_query": {
+            "id": str(next(_update_ids)),
+            "chat_instance": "bench",
+            "from": tg_user(user_id),
+            "data": button.callback_data,
+            "message": {
+                "message_id": next(_message_ids),
+                "date": int(time.time()),
+                "chat": {"id": user_id, "type": "private"},
+                "text": "menu",
+            },
+        },
+    }
+    update = Update.de_json(data, bot)
+    bot.insert_callback_data(update)  # type: ignore
+    return update  # type: ignore
+
+
+def inline_query_update(bot: Bot, query: str, *, user_id: int, offset: str = "") -> Update:
+    data = {
+        "update_id": next(_update_ids),
+        "inline_query": {
+            "id": str(next(_update_ids)),
+            "from": tg_user(user_id),
+            "query": query,
+            "offset": offset,
+        },
+    }
+    return Update.de_json(data, bot)  # type: ignore
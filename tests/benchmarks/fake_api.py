@@ -0,0 +1,193 @@
+import asyncio
+import json
+import time
+from typing import Any, Callable, Optional, Tuple
+import re
+from urllib.parse import parse_qs
+
+from telegram.request import BaseRequest, RequestData
+
+_MULTIPART_FIELD = re.compile(rb'name="(\w+)"\r\n\r\n([^\r]*)\r\n')
+
+BOT_ID = 123456
+BOT_TOKEN = f"{BOT_ID}:BENCHMARK"
+
+BOT_USER = {
+    "id": BOT_ID,
+    "is_bot": True,
+    "first_name": "Benchmark",
+    "username": "benchmark_bot",
+    "can_join_groups": True,
+    "can_read_all_group_messages": False,
+    "supports_inline_queries": True,
+}
+
+
+class FakeBotAPI(BaseRequest):
+    """
+    In-process stand-in for the Bot API. Every call is answered immediately with a plausible
+    result and recorded in `calls` as `(endpoint, perf_counter(), parameters)`, so benchmarks can
+    measure when a request left the bot without any network involved.
+    """
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, float, dict]] = []
+        self._message_id = 0
+        self._results: dict[str, Callable[[dict], Any]] = {
+            "getMe": lambda _: BOT_USER,
+            "sendMessage": self._message,
+            "editMessageText": self._message,
+            "sendPhoto": lambda params: self._media_message("photo", params),
+            "sendDocument": lambda params: self._media_message("document", params),
+            "sendVoice": lambda params: self._media_message("voice", params),
+        }
+        self.uploads = 0
+        self._errors: dict[str, list[str]] = {}
+
+    def fail(self, endpoint: str, description: str):
+        """
+        Answers the next call of `endpoint` with a 400 error, e.g. `"Bad Request: chat not found"`
+        """
+        self._errors.setdefault(endpoint, []).append(description)
+
+    @property
+    def read_timeout(self) -> Optional[float]:
+        return None
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    def endpoint_calls(self, endpoint: str) -> list[float]:
+        return [t for name, t, _ in self.calls if name == endpoint]
+
+    def endpoint_params(self, endpoint: str) -> list[dict]:
+        return [params for name, _, params in self.calls if name == endpoint]
+
+    def _message(self, params: dict) -> dict:
+        self._message_id += 1
+        return {
+            "message_id": self._message_id,
+            "date": int(time.time()),
+            "chat": {"id": int(params.get("chat_id", 0)), "type": "private"},
+            "from": BOT_USER,
+            "text": params.get("text", ""),
+        }
+
+    def _media_message(self, kind: str, params: dict) -> dict:
+        """
+        Files sent by `file_id` are echoed back, uploads get a new `file_id`
+        """
+        file_id = params.get(kind)
+        if file_id is None or str(file_id).startswith("attach://"):
+            self.uploads += 1
+            file_id = f"{kind}-{self.uploads}"
+        file = {"file_id": file_id, "file_unique_id": file_id}
+        if kind == "photo":
+            file |= {"width": 1, "height": 1}
+        if kind == "voice":
+            file |= {"duration": 1}
+        message = self._message(params)
+        message[kind] = [file] if kind == "photo" else file
+        return message
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: Optional[RequestData] = None,
+        read_timeout=None,
+        write_timeout=None,
+        connect_timeout=None,
+        pool_timeout=None,
+    ) -> Tuple[int, bytes]:
+        endpoint = url.rsplit("/", 1)[-1]
+        params = request_data.parameters if request_data else {}
+        if errors := self._errors.get(endpoint):
+            self.calls.append((endpoint, time.perf_counter(), params))
+            error = {"ok": False, "error_code": 400, "description": errors.pop(0)}
+            return 400, json.dumps(error).encode()
+        return 200, self.respond(endpoint, params)
+
+    def respond(self, endpoint: str, params: dict) -> bytes:
+        self.calls.append((endpoint, time.perf_counter(), params))
+        result = self._results.get(endpoint, lambda _: True)(params)
+        return json.dumps({"ok": True, "result": result}).encode()
+
+
+class FakeHTTPBotAPI:
+    """
+    The same fake Bot API served over HTTP/1.1 with keep-alive on a local port, for benchmarks
+    of the HTTP transport. Every response is delayed by `latency` to simulate the round trip
+    to Telegram.
+
+    ```
+    async with FakeHTTPBotAPI(latency=0.01) as api:
+        bot = Bot(BOT_TOKEN, base_url=api.base_url)
+    ```
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.api = FakeBotAPI()
+        self.connections = 0
+        self.uploads = 0
+        self._server: asyncio.Server | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]  # type: ignore
+        return f"http://{host}:{port}/bot"
+
+    async def __aenter__(self) -> "FakeHTTPBotAPI":
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()  # type: ignore
+        await self._server.wait_closed()  # type: ignore
+
+    async def _read_body(self, reader: asyncio.StreamReader, headers: dict) -> dict:
+        length = int(headers.get("content-length", 0))
+        content_type = headers.get("content-type", "")
+        if not content_type.startswith("multipart/form-data"):
+            body = await reader.readexactly(length)
+            return {k: v[0] for k, v in parse_qs(body.decode()).items()}
+        # Uploads are consumed in chunks so the server doesn't show up in memory benchmarks,
+        # httpx writes the plain fields before the files
+        head = b""
+        while length:
+            chunk = await reader.readexactly(min(length, 64 * 1024))
+            length -= len(chunk)
+            if not head:
+                head = chunk
+        self.uploads += 1
+        return {
+            name.decode(): value.decode()
+            for name, value in _MULTIPART_FIELD.findall(head)
+        }
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while request_line := await reader.readline():
+                path = request_line.split()[1].decode()
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                params = await self._read_body(reader, headers)
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                payload = self.api.respond(path.rsplit("/", 1)[-1], params)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(payload), payload)
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
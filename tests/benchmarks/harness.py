@@ -0,0 +1,145 @@
+import json
+import os
+import statistics
+import time
+import tracemalloc
+import warnings
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+
+BENCH_SAVE = os.environ.get("BENCH_SAVE") == "1"
+"""
+Overwrite the stored baselines with the results of this run
+"""
+BENCH_STRICT = os.environ.get("BENCH_STRICT") == "1"
+"""
+Fail instead of warn when a benchmark regresses past its baseline
+"""
+BENCH_TOLERANCE = float(os.environ.get("BENCH_TOLERANCE", "1.5"))
+"""
+Allowed slowdown (or allocation growth) factor before a result counts as a regression
+"""
+BENCH_ROUNDS = int(os.environ.get("BENCH_ROUNDS", "300"))
+
+
+class BenchmarkRegression(UserWarning):
+    pass
+
+
+@dataclass(slots=True)
+class BenchResult:
+    name: str
+    rounds: int
+    median_us: float
+    p99_us: float
+    min_us: float
+    peak_bytes: int
+    """
+    Median high-water mark of memory allocated while a single call is running
+    """
+
+    def summary(self) -> str:
+        return (
+            f"{self.name:<45} median {self.median_us:>9.1f}us  p99 {self.p99_us:>9.1f}us  "
+            f"min {self.min_us:>9.1f}us  peak {self.peak_bytes / 1024:>8.1f}KiB"
+        )
+
+
+def _load_baselines() -> dict[str, dict[str, Any]]:
+    if not BASELINES_PATH.exists():
+        return {}
+    return json.loads(BASELINES_PATH.read_text())
+
+
+class Bench:
+    """
+    Minimal pytest-benchmark style runner for coroutines. Every call is timed individually,
+    allocations are measured in a separate pass with `tracemalloc` so tracing overhead
+    doesn't leak into the timings. Results are compared against `baselines.json`.
+    """
+
+    results: list[BenchResult] = []
+
+    def __init__(self, name: str):
+        self.name = name
+
+    async def __call__(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        *,
+        rounds: int = BENCH_ROUNDS,
+        warmup: int = 20,
+        alloc_rounds: int = 30,
+    ) -> BenchResult:
+        for _ in range(warmup):
+            await fn()
+
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter_ns()
+            await fn()
+            timings.append(time.perf_counter_ns() - start)
+
+        peaks = []
+        tracemalloc.start()
+        try:
+            for _ in range(alloc_rounds):
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                await fn()
+                _, peak = tracemalloc.get_traced_memory()
+                peaks.append(peak - before)
+        finally:
+            tracemalloc.stop()
+
+        result = self.result(timings, peak_bytes=int(statistics.median(peaks)))
+        self.record(result)
+        return result
+
+    def result(self, timings_ns: list[int], *, peak_bytes: int = 0) -> BenchResult:
+        """
+        Summarizes latencies measured by the benchmark itself, e.g. the time until a request
+        reached the fake Bot API.
+        """
+        timings = sorted(timings_ns)
+        return BenchResult(
+            name=self.name,
+            rounds=len(timings),
+            median_us=statistics.median(timings) / 1000,
+            p99_us=timings[min(len(timings) - 1, int(len(timings) * 0.99))] / 1000,
+            min_us=timings[0] / 1000,
+            peak_bytes=peak_bytes,
+        )
+
+    @classmethod
+    def record(cls, result: BenchResult):
+        cls.results.append(result)
+        baseline = _load_baselines().get(result.name)
+        if BENCH_SAVE or baseline is None:
+            return
+        regressions = [
+            f"{key} {getattr(result, key):.1f} > {baseline[key]:.1f} * {BENCH_TOLERANCE}"
+            for key in ("median_us", "peak_bytes")
+            if key in baseline and getattr(result, key) > baseline[key] * BENCH_TOLERANCE
+        ]
+        if not regressions:
+            return
+        message = f"Benchmark {result.name} regressed: {', '.join(regressions)}"
+        if BENCH_STRICT:
+            raise AssertionError(message)
+        warnings.warn(message, BenchmarkRegression)
+
+    @classmethod
+    def save_baselines(cls):
+        baselines = _load_baselines()
+        for result in cls.results:
+            data = asdict(result)
+            del data["name"]
+            baselines[result.name] = {
+                key: round(value, 1) if isinstance(value, float) else value
+                for key, value in data.items()
+            }
+        BASELINES_PATH.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
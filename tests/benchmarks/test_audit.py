@@ -0,0 +1,65 @@
+"""
+Latency an audit event adds to the handler that produces it: buffered by `AuditLog` and written
+in batches, against inserting it in the handler's own transaction.
+"""
+from datetime import datetime
+
+from fast_depends import Depends, inject
+from sqlalchemy.ext.asyncio import AsyncSession
+from telegram import Update
+
+from src.bot.common.audit import AuditLog
+from src.bot.common.context import ApplicationContext
+from src.bot.common.wrappers import command_handler
+from src.bot.extractors import load_user, tx
+from src.db.tables import AuditEvent, User
+from tests.benchmarks.factories import command_update
+from tests.benchmarks.harness import Bench
+from tests.benchmarks.test_handlers import dispatch
+from tests.conftest import ADMIN_ID
+
+
+@inject
+async def without_audit(
+    update: Update,
+    context: ApplicationContext,
+    session: AsyncSession = Depends(tx),
+    user: User = Depends(load_user),
+):
+    pass
+
+
+@inject
+async def buffered_audit(
+    update: Update,
+    context: ApplicationContext,
+    session: AsyncSession = Depends(tx),
+    user: User = Depends(load_user),
+):
+    context.audit.record_on_commit(session, "bench", actor_id=user.telegram_id, target_id=1)
+
+
+@inject
+async def inline_audit(
+    update: Update,
+    context: ApplicationContext,
+    session: AsyncSession = Depends(tx),
+    user: User = Depends(load_user),
+):
+    session.add(
+        AuditEvent(created_at=datetime.utcnow(), action="bench", actor_id=user.telegram_id, target_id=1)
+    )
+
+
+async def test_audit_latency(application, session_factory, bench):
+    # Only the handler's share, the buffered events are written after the measurement
+    application.bot_data._audit = AuditLog(session_factory, flush_interval=60, max_batch=10_000)
+    update = command_update(application.bot, "/bench", user_id=ADMIN_ID)
+    results = {}
+    for name, f in [("none", without_audit), ("buffered", buffered_audit), ("inline", inline_audit)]:
+        handler = command_handler("bench")(f)
+        results[name] = await Bench(f"{bench.name}[{name}]")(
+            lambda: dispatch(application, handler, update), rounds=300
+        )
+    await application.bot_data._audit.shutdown()
+    assert results["buffered"].median_us < results["inline"].median_us
@@ -0,0 +1,96 @@
+"""
+Handler latency while an online backup of a large file database runs in the background, against
+the same handler with the database idle. `BENCH_BACKUP_MB=4096` runs it on a multi-GB database.
+"""
+import asyncio
+import itertools
+import os
+import sqlite3
+
+import pytest
+from fast_depends import Depends, inject
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from telegram import Update
+
+from src.bot.common.context import ApplicationContext
+from src.bot.common.wrappers import command_handler, reply_exception
+from src.bot.extractors import load_user, tx
+from src.db.backup import SQLiteBackup
+from src.db.config import create_engine
+from src.db.tables import Base, User, UserRole
+from tests.benchmarks.factories import command_update
+from tests.benchmarks.harness import Bench
+from tests.benchmarks.test_handlers import dispatch, replying
+from tests.conftest import ADMIN_ID
+
+DB_MB = int(os.environ.get("BENCH_BACKUP_MB", 64))
+
+_renames = itertools.count()
+
+
+@reply_exception
+@inject
+async def writing(
+    update: Update,
+    context: ApplicationContext,
+    session: AsyncSession = Depends(tx),
+    user: User = Depends(load_user),
+):
+    # Commits a write every update, the backup must not make it wait for the database lock
+    user.full_name = f"Admin {next(_renames)}"
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """
+    Overrides the in-memory database of `tests/conftest.py` with a file the backup can read
+    """
+    db_path = tmp_path / "bench.db"
+    engine = create_engine(str(db_path))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+    async with factory() as session:
+        session.add(User(telegram_id=ADMIN_ID, is_bot=False, full_name="Admin", telegram_username="admin", role=UserRole.ADMIN))
+        await session.commit()
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE filler (payload BLOB)")
+        chunk = os.urandom(64 * 1024)
+        conn.executemany("INSERT INTO filler VALUES (?)", [(chunk,)] * (DB_MB * 16))
+    factory.db_path = db_path  # type: ignore
+    yield factory
+    await engine.dispose()
+
+
+async def measure_during_backup(application, session_factory, handler, name, tmp_path):
+    update = command_update(application.bot, "/bench", user_id=ADMIN_ID)
+    backups = SQLiteBackup(session_factory.db_path, tmp_path / "backups")
+
+    idle = await Bench(f"{name}[idle]")(lambda: dispatch(application, handler, update), rounds=300)
+
+    running = asyncio.create_task(backups.run())
+    await asyncio.sleep(0.05)
+    during = await Bench(f"{name}[backup]")(
+        lambda: dispatch(application, handler, update), rounds=300
+    )
+    assert backups.running, "backup finished before the measurement, raise BENCH_BACKUP_MB"
+    snapshot = await running
+    assert snapshot.exists()
+    return idle, during
+
+
+async def test_handler_during_backup(application, session_factory, bench, tmp_path):
+    handler = command_handler("bench")(replying)
+    idle, during = await measure_during_backup(
+        application, session_factory, handler, bench.name, tmp_path
+    )
+    assert during.median_us < idle.median_us * 2
+
+
+async def test_writing_handler_during_backup(application, session_factory, bench, tmp_path):
+    handler = command_handler("bench")(writing)
+    idle, during = await measure_during_backup(
+        application, session_factory, handler, bench.name, tmp_path
+    )
+    assert during.median_us < idle.median_us * 2
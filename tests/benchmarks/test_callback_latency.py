@@ -0,0 +1,54 @@
+"""
+Click to spinner-stop latency: time from the start of dispatching a callback query until
+`answerCallbackQuery` reaches the (fake) Bot API, for a handler that spends `HANDLER_WORK` in
+DB work and outbound sends.
+"""
+import asyncio
+import time
+
+from src.bot.common.callback import arbitrary_callback_query_handler
+from src.bot.common.context import ApplicationContext
+from tests.benchmarks.factories import callback_update
+from tests.benchmarks.test_handlers import OPEN_MENU, dispatch
+from tests.conftest import USER_ID
+
+HANDLER_WORK = 0.005
+ROUNDS = 40
+
+
+async def slow_handler(update, context: ApplicationContext):
+    await asyncio.sleep(HANDLER_WORK)
+    context.answer_callback("Done")
+
+
+async def measure(application, fake_api, bench, handler):
+    markup = application.bot.callback_data_cache.process_keyboard(
+        OPEN_MENU(menu_id=1).to_keyboard()
+    )
+    latencies = []
+    for _ in range(ROUNDS):
+        update = callback_update(application.bot, markup, user_id=USER_ID)
+        fake_api.calls.clear()
+        start = time.perf_counter()
+        await dispatch(application, handler, update)
+        answered = fake_api.endpoint_calls("answerCallbackQuery")[0]
+        latencies.append(int((answered - start) * 1e9))
+    result = bench.result(latencies)
+    bench.record(result)
+    return result
+
+
+async def test_answer_after_handler(application, fake_api, bench):
+    handler = arbitrary_callback_query_handler(OPEN_MENU)(slow_handler)
+    result = await measure(application, fake_api, bench, handler)
+    assert result.min_us >= HANDLER_WORK * 1e6
+
+
+async def test_answer_early(application, fake_api, bench):
+    handler = arbitrary_callback_query_handler(
+        OPEN_MENU, answer_query_early=True, late_answer="message"
+    )(slow_handler)
+    result = await measure(application, fake_api, bench, handler)
+    assert result.median_us < HANDLER_WORK * 1e6
+    # The toast was set after the early answer, so it is delivered as a message when asked to
+    assert fake_api.endpoint_calls("sendMessage")
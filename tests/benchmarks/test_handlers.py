@@ -0,0 +1,121 @@
+"""
+Per-layer benchmarks of the handler stack. Each benchmark adds one layer on top of the previous
+ones, so the difference between two results is the cost of that layer for a single update.
+"""
+from fast_depends import Depends, inject
+from sqlalchemy.ext.asyncio import AsyncSession
+from telegram import Update
+from telegram.ext import Application, BaseHandler
+
+from src.bot.common.callback import CallbackButton, arbitrary_callback_query_handler
+from src.bot.common.context import ApplicationContext
+from src.bot.common.wrappers import command_handler, reply_exception
+from src.bot.extractors import load_user, tx
+from src.db.tables import User
+from tests.conftest import ADMIN_ID
+from tests.benchmarks.factories import callback_update, command_update
+
+
+class OPEN_MENU(CallbackButton):
+    menu_id: int
+    page: int = 0
+
+
+async def dispatch(application: Application, handler: BaseHandler, update: Update):
+    check = handler.check_update(update)
+    assert check is not None and check is not False
+    context = ApplicationContext.from_update(update, application)
+    await handler.handle_update(update, application, check, context)
+
+
+async def noop(update: Update, context: ApplicationContext):
+    pass
+
+
+@inject
+async def injected(update: Update, context: ApplicationContext):
+    pass
+
+
+@inject
+async def with_session(
+    update: Update, context: ApplicationContext, session: AsyncSession = Depends(tx)
+):
+    pass
+
+
+@inject
+async def with_user(
+    update: Update,
+    context: ApplicationContext,
+    session: AsyncSession = Depends(tx),
+    user: User = Depends(load_user),
+):
+    assert user.telegram_id == ADMIN_ID
+
+
+@reply_exception
+@inject
+async def replying(
+    update: Update,
+    context: ApplicationContext,
+    session: AsyncSession = Depends(tx),
+    user: User = Depends(load_user),
+):
+    await update.effective_message.reply_text(f"Hello {user.full_name}")
+
+
+async def test_command_handler(application, bench):
+    handler = command_handler("bench")(noop)
+    update = command_update(application.bot, "/bench", user_id=ADMIN_ID)
+    await bench(lambda: dispatch(application, handler, update))
+
+
+async def test_reply_exception(application, bench):
+    handler = command_handler("bench")(reply_exception(noop))
+    update = command_update(application.bot, "/bench", user_id=ADMIN_ID)
+    await bench(lambda: dispatch(application, handler, update))
+
+
+async def test_inject(application, bench):
+    handler = command_handler("bench")(injected)
+    update = command_update(application.bot, "/bench", user_id=ADMIN_ID)
+    await bench(lambda: dispatch(application, handler, update))
+
+
+async def test_inject_tx(application, bench):
+    handler = command_handler("bench")(with_session)
+    update = command_update(application.bot, "/bench", user_id=ADMIN_ID)
+    await bench(lambda: dispatch(application, handler, update))
+
+
+async def test_inject_tx_load_user(application, bench):
+    handler = command_handler("bench")(with_user)
+    update = command_update(application.bot, "/bench", user_id=ADMIN_ID)
+    await bench(lambda: dispatch(application, handler, update))
+
+
+async def test_full_stack_with_reply(application, fake_api, bench):
+    handler = command_handler("bench")(replying)
+    update = command_update(application.bot, "/bench", user_id=ADMIN_ID)
+    await bench(lambda: dispatch(application, handler, update))
+    assert fake_api.endpoint_calls("sendMessage")
+
+
+async def test_arbitrary_callback_query_handler(application, fake_api, bench):
+    handler = arbitrary_callback_query_handler(OPEN_MENU)(noop)
+    markup = application.bot.callback_data_cache.process_keyboard(
+        OPEN_MENU(menu_id=1).to_keyboard()
+    )
+    update = callback_update(application.bot, markup, user_id=ADMIN_ID)
+    await bench(lambda: dispatch(application, handler, update))
+    assert fake_api.endpoint_calls("answerCallbackQuery")
+
+
+async def test_callback_button_serialization(application, bench):
+    cache = application.bot.callback_data_cache
+
+    async def serialize():
+        cache.process_keyboard(OPEN_MENU(menu_id=1, page=2).to_keyboard(emoji="📂"))
+
+    await bench(serialize)
@@ -0,0 +1,81 @@
+"""
+Inline user search over a large `users` table: the FTS5 index against a `LIKE` scan, and the
+handler answering a repeated query from its result cache.
+`BENCH_FTS_ROWS=1000000` runs it at full size.
+"""
+import itertools
+import os
+import random
+
+from sqlalchemy import func, insert, or_, select
+
+from src.bot import inline
+from src.bot.inline import inline_user_search, search_users
+from src.db.tables import User
+from tests.benchmarks.factories import inline_query_update
+from tests.benchmarks.harness import Bench
+from tests.conftest import USER_ID
+
+ROWS = int(os.environ.get("BENCH_FTS_ROWS", 20_000))
+FIRST = ["alice", "bruno", "chiara", "dmitri", "elena", "farid", "greta", "hiro", "ines", "jonas"]
+LAST = ["rossi", "smith", "novak", "tanaka", "silva", "kowalski", "moreau", "berg", "costa", "weber"]
+QUERIES = ["ali", "smi", "hiro tan", "ele cos", "jon", "nov", "gre ber", "dmitri", "weber123", "hiro_45"]
+
+
+async def populate(session_factory):
+    rng = random.Random(0)
+    rows = (
+        {
+            "telegram_id": 10_000 + i,
+            "is_bot": False,
+            "full_name": f"{rng.choice(FIRST).title()} {rng.choice(LAST).title()}{i}",
+            "telegram_username": f"{rng.choice(FIRST)}_{i}",
+        }
+        for i in range(ROWS)
+    )
+    async with session_factory() as session:
+        while batch := list(itertools.islice(rows, 10_000)):
+            await session.execute(insert(User), batch)
+        await session.commit()
+
+
+async def test_search(session_factory, bench):
+    await populate(session_factory)
+    queries = itertools.cycle(QUERIES)
+
+    async with session_factory() as session:
+
+        async def fts():
+            await search_users(session, next(queries))
+
+        fts_result = await Bench(f"{bench.name}[fts5]")(fts, rounds=200)
+
+        async def like():
+            words = next(queries).split()
+            await session.execute(
+                select(User.id, User.full_name, User.telegram_username)
+                .where(
+                    *(
+                        or_(
+                            func.lower(User.full_name).contains(word),
+                            func.lower(User.telegram_username).contains(word),
+                        )
+                        for word in words
+                    )
+                )
+                .order_by(User.id)
+                .limit(inline.PAGE_SIZE)
+            )
+
+        like_result = await Bench(f"{bench.name}[like]")(like, rounds=20)
+    assert fts_result.median_us < like_result.median_us
+
+
+async def test_cached_inline_query(application, session_factory, bench):
+    await populate(session_factory)
+    application.add_handler(inline_user_search)
+
+    async def answer():
+        await application.process_update(inline_query_update(application.bot, "smi", user_id=USER_ID))
+
+    await bench(answer)
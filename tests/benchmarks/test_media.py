@@ -0,0 +1,40 @@
+"""
+Sending a large local file over HTTP: the first send uploads it through a memory map, repeat sends
+only pass the cached `file_id`.
+"""
+import time
+import tracemalloc
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from telegram import Bot
+
+from src.bot.common.media import MediaCache
+from tests.benchmarks.fake_api import BOT_TOKEN, FakeHTTPBotAPI
+from tests.benchmarks.harness import Bench
+
+FILE_SIZE = 8 * 1024 * 1024
+
+
+async def test_upload_then_reuse(session_factory: async_sessionmaker[AsyncSession], bench, tmp_path):
+    video = tmp_path / "video.bin"
+    video.write_bytes(bytes(range(256)) * (FILE_SIZE // 256))
+
+    async with FakeHTTPBotAPI() as api:
+        async with Bot(BOT_TOKEN, base_url=api.base_url) as bot:
+            media = MediaCache(bot, session_factory)
+
+            tracemalloc.start()
+            start = time.perf_counter_ns()
+            await media.send_document(1, video)
+            upload_ns = time.perf_counter_ns() - start
+            _, upload_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert api.uploads == 1
+            assert upload_peak < FILE_SIZE / 2
+            Bench.record(Bench(f"{bench.name}[upload]").result([upload_ns], peak_bytes=upload_peak))
+
+            async def repeat():
+                await media.send_document(1, video)
+
+            await bench(repeat, rounds=50, warmup=5, alloc_rounds=10)
+            assert api.uploads == 1
@@ -0,0 +1,46 @@
+"""
+Overhead of the profiling tools: the slow update log on every update, and handler latency while
+the sampling profiler is running.
+"""
+import asyncio
+
+from telegram.ext import SimpleUpdateProcessor
+
+from src.bot.common.profiling import SamplingProfiler, SlowUpdateLog
+from src.bot.common.wrappers import command_handler
+from tests.benchmarks.factories import command_update
+from tests.benchmarks.harness import Bench
+from tests.benchmarks.test_handlers import dispatch, replying
+from tests.conftest import ADMIN_ID
+
+
+async def noop():
+    pass
+
+
+async def test_update_processor(bench):
+    update = object()
+    for name, processor in [("simple", SimpleUpdateProcessor(1)), ("slow_update_log", SlowUpdateLog())]:
+
+        async def process():
+            await processor.process_update(update, noop())
+
+        await Bench(f"{bench.name}[{name}]")(process, rounds=2000)
+
+
+async def test_handler_while_profiling(application, bench):
+    handler = command_handler("bench")(replying)
+    update = command_update(application.bot, "/bench", user_id=ADMIN_ID)
+
+    idle = await Bench(f"{bench.name}[idle]")(lambda: dispatch(application, handler, update), rounds=300)
+
+    profiler = SamplingProfiler()
+    profiling = asyncio.create_task(profiler.profile(30))
+    await asyncio.sleep(0.01)
+    sampled = await Bench(f"{bench.name}[profiling]")(
+        lambda: dispatch(application, handler, update), rounds=300
+    )
+    assert profiler.running
+    profiling.cancel()
+    await asyncio.gather(profiling, return_exceptions=True)
+    assert sampled.median_us < idle.median_us * 1.5
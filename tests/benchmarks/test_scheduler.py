@@ -0,0 +1,78 @@
+import tracemalloc
+from datetime import timedelta
+
+from sqlalchemy import insert
+
+from src.bot.common.scheduler import JobScheduler, utcnow
+from src.bot.common.timing_wheel import TimingWheel
+from src.db.tables import ScheduledJob
+
+PENDING = 100_000
+
+
+async def noop(context):
+    pass
+
+
+async def test_timing_wheel_schedule_cancel(bench):
+    """
+    Scheduling and cancelling a conversation timeout with 100k timeouts already pending
+    """
+    wheel = TimingWheel()
+    for _ in range(PENDING):
+        wheel.schedule(300)
+
+    async def reschedule():
+        wheel.schedule(300).schedule_removal()
+
+    await bench(reschedule)
+
+
+async def test_job_queue_schedule_cancel(application, bench):
+    """
+    What `ConversationHandler` does by default, one JobQueue job per conversation
+    """
+    job_queue = application.job_queue
+    await job_queue.start()
+    try:
+        for _ in range(PENDING // 10):
+            job_queue.run_once(noop, 300)
+
+        async def reschedule():
+            job_queue.run_once(noop, 300).schedule_removal()
+
+        await bench(reschedule, rounds=100)
+    finally:
+        await job_queue.stop(wait=False)
+
+
+def test_timing_wheel_memory():
+    tracemalloc.start()
+    wheel = TimingWheel()
+    before, _ = tracemalloc.get_traced_memory()
+    for _ in range(PENDING):
+        wheel.schedule(300)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert (after - before) / PENDING < 200
+
+
+async def test_claim_batch(session_factory, bench):
+    scheduler = JobScheduler(batch_size=100)
+    now = utcnow()
+    async with session_factory() as session:
+        await session.execute(
+            insert(ScheduledJob),
+            [
+                {"name": "job", "run_at": now - timedelta(seconds=i), "attempts": 0}
+                for i in range(20_000)
+            ],
+        )
+        await session.commit()
+
+    async def claim():
+        async with session_factory() as session:
+            assert len(await scheduler.claim(session, now)) == 100
+            await session.commit()
+
+    await bench(claim, rounds=100, warmup=5, alloc_rounds=10)
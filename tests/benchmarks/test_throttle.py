@@ -0,0 +1,26 @@
+from src.bot.common.throttle import FloodControl
+from src.bot.common.wrappers import command_handler
+from tests.conftest import ADMIN_ID
+from tests.benchmarks.factories import command_update
+from tests.benchmarks.test_handlers import with_user
+
+
+async def test_throttled_update(application, bench):
+    """
+    Full `process_update` of an update that is dropped by the flood control, compare with
+    `test_inject_tx_load_user` for what a throttled update saves.
+    """
+    throttle = FloodControl(rate=0, burst=0, notice=None)
+    application.add_handler(throttle, group=-1)
+    application.add_handler(command_handler("bench")(with_user))
+    update = command_update(application.bot, "/bench", user_id=ADMIN_ID)
+    await bench(lambda: application.process_update(update))
+    assert throttle.stats.allowed == 0
+
+
+async def test_allowed_update_overhead(application, bench):
+    throttle = FloodControl(rate=0, burst=float("inf"), notice=None)
+    application.add_handler(throttle, group=-1)
+    update = command_update(application.bot, "/bench", user_id=ADMIN_ID)
+    await bench(lambda: application.process_update(update))
+    assert throttle.stats.dropped == 0
@@ -0,0 +1,47 @@
+"""
+Outbound call latency when many handlers send at the same time, against the fake Bot API served
+over local HTTP with a simulated round trip of `LATENCY`.
+"""
+import asyncio
+import time
+
+from telegram import Bot
+from telegram.request import HTTPXRequest
+
+from src.bot.common.transport import build_request, warm_up
+from src.settings import TelegramSettings
+from tests.benchmarks.fake_api import BOT_TOKEN, FakeHTTPBotAPI
+from tests.benchmarks.harness import Bench
+
+CONCURRENT_SENDS = 32
+ROUNDS = 3
+LATENCY = 0.03
+
+
+async def send_latencies(api: FakeHTTPBotAPI, request: HTTPXRequest, warm: int = 0) -> list[int]:
+    bot = Bot(BOT_TOKEN, base_url=api.base_url, request=request)
+    async with bot:
+        await warm_up(bot, warm)
+
+        async def send():
+            start = time.perf_counter_ns()
+            await bot.send_message(chat_id=1, text="benchmark")
+            return time.perf_counter_ns() - start
+
+        latencies = []
+        for _ in range(ROUNDS):
+            latencies += await asyncio.gather(*(send() for _ in range(CONCURRENT_SENDS)))
+    return latencies
+
+
+async def test_concurrent_sends(bench: Bench):
+    settings = TelegramSettings(BOT_TOKEN=BOT_TOKEN, FIRST_ADMIN=1)
+    async with FakeHTTPBotAPI(latency=LATENCY) as api:
+        single = await send_latencies(api, HTTPXRequest(connection_pool_size=1, pool_timeout=None))
+        tuned = await send_latencies(api, build_request(settings), warm=settings.HTTP_WARM_CONNECTIONS)
+
+    single_result = Bench(f"{bench.name}[pool=1]").result(single)
+    tuned_result = Bench(f"{bench.name}[tuned]").result(tuned)
+    Bench.record(single_result)
+    Bench.record(tuned_result)
+    assert tuned_result.p99_us < single_result.p99_us
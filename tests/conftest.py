@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from telegram.ext import Application, ApplicationBuilder
+
+from src.bot.common.audit import AuditLog
+from src.bot.common.context import context_types
+from src.bot.common.deletion import DeletionQueue
+from src.bot.common.media import MediaCache
+from src.db.config import create_engine
+from src.db.tables import Base, User, UserRole
+from tests.benchmarks.fake_api import BOT_TOKEN, FakeBotAPI
+
+ADMIN_ID = 1000
+USER_ID = 1001
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_engine(":memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+    async with factory() as session:
+        session.add(User(telegram_id=ADMIN_ID, is_bot=False, full_name="Admin", telegram_username="admin", role=UserRole.ADMIN))
+        session.add(User(telegram_id=USER_ID, is_bot=False, full_name="User", telegram_username="user"))
+        await session.commit()
+    yield factory
+    await engine.dispose()
+
+
+@pytest.fixture
+def fake_api() -> FakeBotAPI:
+    return FakeBotAPI()
+
+
+@pytest.fixture
+async def application(fake_api: FakeBotAPI, session_factory):
+    app: Application = (
+        ApplicationBuilder()
+        .token(BOT_TOKEN)
+        .context_types(context_types)
+        .arbitrary_callback_data(True)
+        .request(fake_api)
+        .get_updates_request(FakeBotAPI())
+        .updater(None)
+        .build()
+    )
+    app.bot_data._db = session_factory
+    app.bot_data._deletion_queue = DeletionQueue(app.bot, debounce=0.01)
+    app.bot_data._media = MediaCache(app.bot, session_factory)
+    app.bot_data._audit = AuditLog(session_factory, flush_interval=0.01)
+    await app.initialize()
+    yield app
+    await app.bot_data._audit.shutdown()
+    await app.shutdown()
@@ -0,0 +1,71 @@
+import asyncio
+
+from sqlalchemy import event, func, select
+from telegram import InlineKeyboardMarkup
+
+from src.bot.admin import audit, audit_older
+from src.bot.common.audit import AuditLog, audit_page
+from src.db.tables import AuditEvent
+from tests.benchmarks.factories import callback_update, command_update
+from tests.conftest import ADMIN_ID, USER_ID
+
+
+async def test_events_are_written_in_batches(session_factory):
+    log = AuditLog(session_factory, flush_interval=0.01, max_batch=500)
+    commits = []
+    event.listen(session_factory.kw["bind"].sync_engine, "commit", commits.append)
+
+    for i in range(1200):
+        log.record("tick", actor_id=USER_ID, n=i)
+    await asyncio.sleep(0.05)
+    await log.shutdown()
+
+    assert len(commits) == 3
+    async with session_factory() as session:
+        events = (await session.scalars(select(AuditEvent).order_by(AuditEvent.id))).all()
+    assert [e.data["n"] for e in events] == list(range(1200))
+
+
+async def test_record_on_commit(session_factory):
+    log = AuditLog(session_factory, flush_interval=0.01)
+    async with session_factory() as session:
+        log.record_on_commit(session, "kept", actor_id=ADMIN_ID)
+        await session.commit()
+    async with session_factory() as session:
+        log.record_on_commit(session, "discarded", actor_id=ADMIN_ID)
+        await session.rollback()
+    await log.shutdown()
+
+    async with session_factory() as session:
+        assert [e.action for e in await audit_page(session)] == ["kept"]
+
+
+async def test_audit_command_pages(application, fake_api, session_factory):
+    log = application.bot_data._audit
+    for i in range(25):
+        log.record("role_changed" if i % 2 else "registered", actor_id=ADMIN_ID, target_id=i)
+    await log.shutdown()
+    application.add_handlers([audit, audit_older])
+
+    await application.process_update(command_update(application.bot, "/audit", user_id=ADMIN_ID))
+    reply = fake_api.endpoint_params("sendMessage")[-1]
+    lines = reply["text"].splitlines()
+    assert len(lines) == 20 and lines[0].startswith("#25 ")
+
+    markup = InlineKeyboardMarkup.de_json(reply["reply_markup"], application.bot)
+    await application.process_update(callback_update(application.bot, markup, user_id=ADMIN_ID))
+    older = fake_api.endpoint_params("editMessageText")[-1]
+    assert [line.split()[0] for line in older["text"].splitlines()] == ["#5", "#4", "#3", "#2", "#1"]
+    assert "reply_markup" not in older
+
+    await application.process_update(
+        command_update(application.bot, "/audit registered", user_id=ADMIN_ID)
+    )
+    lines = fake_api.endpoint_params("sendMessage")[-1]["text"].splitlines()
+    assert len(lines) == 13 and all(" registered by " in line for line in lines)
+
+
+async def test_audit_command_requires_admin(application, fake_api):
+    application.add_handler(audit)
+    await application.process_update(command_update(application.bot, "/audit", user_id=USER_ID))
+    assert not fake_api.endpoint_params("sendMessage")
@@ -0,0 +1,94 @@
+import asyncio
+import gzip
+import sqlite3
+
+import pytest
+
+from src.bot.admin import backup
+from src.bot.errors import handle_error
+from src.db.backup import BackupInProgress, SQLiteBackup
+from tests.benchmarks.factories import command_update
+from tests.conftest import ADMIN_ID, USER_ID
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "app.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, payload BLOB)")
+        conn.executemany("INSERT INTO items (payload) VALUES (?)", [(bytes(500),)] * 2000)
+    return path
+
+
+def restore(snapshot, target):
+    target.write_bytes(gzip.decompress(snapshot.read_bytes()))
+    with sqlite3.connect(target) as conn:
+        return conn.execute("SELECT count(*) FROM items").fetchone()[0]
+
+
+async def test_snapshots_and_retention(db_path, tmp_path):
+    backups = SQLiteBackup(db_path, tmp_path / "backups", keep=2, pages_per_step=16, step_sleep=0)
+    snapshots = [await backups.run() for _ in range(3)]
+
+    assert backups.snapshots() == snapshots[1:]
+    # No leftover uncompressed copies or partial files
+    assert sorted(backups.directory.iterdir()) == snapshots[1:]
+    assert restore(snapshots[-1], tmp_path / "restored.db") == 2000
+
+    stats = backups.stats
+    assert (stats.backups, stats.failures, stats.running) == (3, 0, False)
+    assert stats.pages_total > 16 and stats.progress == 1
+    assert stats.last_snapshot == snapshots[-1] and stats.last_size > 0
+
+
+async def test_one_backup_at_a_time(db_path, tmp_path):
+    backups = SQLiteBackup(db_path, tmp_path / "backups", pages_per_step=1, step_sleep=0.001)
+    running = asyncio.create_task(backups.run())
+    await asyncio.sleep(0)
+    with pytest.raises(BackupInProgress):
+        await backups.run()
+    await running
+
+
+async def test_backup_command(application, fake_api, db_path, tmp_path):
+    application.bot_data._backup = SQLiteBackup(db_path, tmp_path / "backups")
+    application.add_handler(backup)
+    application.add_error_handler(handle_error)  # type: ignore
+
+    await application.process_update(command_update(application.bot, "/backup", user_id=USER_ID))
+    assert fake_api.endpoint_params("sendMessage")[-1]["text"] == "Unauthorized"
+
+    await application.process_update(command_update(application.bot, "/backup", user_id=ADMIN_ID))
+    assert fake_api.endpoint_params("sendMessage")[-1]["text"] == "Backup started"
+    while len(fake_api.endpoint_params("sendMessage")) < 3:
+        await asyncio.sleep(0.01)
+    assert "Last snapshot: app-" in fake_api.endpoint_params("sendMessage")[-1]["text"]
+
+
+async def test_writes_during_backup(db_path, tmp_path):
+    backups = SQLiteBackup(db_path, tmp_path / "backups", pages_per_step=1, step_sleep=0)
+    writer = sqlite3.connect(db_path, timeout=0, check_same_thread=False)
+    progress = backups._progress
+    steps = 0
+
+    def write_between_steps(status, remaining, total):
+        nonlocal steps
+        progress(status, remaining, total)
+        steps += 1
+        # A restarted copy would never finish
+        assert steps <= total
+        # Fails with "database is locked" if the backup blocks writers
+        writer.execute("INSERT INTO items (payload) VALUES (?)", (bytes(500),))
+        writer.commit()
+
+    backups._progress = write_between_steps  # type: ignore
+    try:
+        snapshot = await backups.run()
+    finally:
+        writer.close()
+
+    # One step per page, writes never restarted the copy
+    assert steps == backups.stats.pages_total
+    # The snapshot is the database as it was when the backup started
+    assert restore(snapshot, tmp_path / "restored.db") == 2000
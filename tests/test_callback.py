@@ -0,0 +1,54 @@
+import asyncio
+
+from telegram import Update
+
+from src.bot.common.callback import answer_inline_query_early, regex_callback_query_handler
+from src.bot.common.context import ApplicationContext
+from tests.conftest import USER_ID
+
+
+def callback_update(bot, *, inline: bool = False) -> Update:
+    query = {
+        "id": "1",
+        "chat_instance": "test",
+        "from": {"id": USER_ID, "is_bot": False, "first_name": "User"},
+        "data": "delete",
+    }
+    if inline:
+        query["inline_message_id"] = "inline"
+    else:
+        query["message"] = {
+            "message_id": 1,
+            "date": 0,
+            "chat": {"id": USER_ID, "type": "private"},
+            "text": "menu",
+        }
+    return Update.de_json({"update_id": 1, "callback_query": query}, bot)  # type: ignore
+
+
+async def slow_delete(update, context):
+    await asyncio.sleep(0.02)
+    context.answer_callback("Item deleted")
+
+
+async def test_late_answer_is_dropped_by_default(application, fake_api):
+    application.add_handler(
+        regex_callback_query_handler("delete", answer_query_early=True)(slow_delete)
+    )
+    await application.process_update(callback_update(application.bot))
+    assert [p.get("text") for p in fake_api.endpoint_params("answerCallbackQuery")] == [None]
+    assert not fake_api.endpoint_calls("sendMessage")
+
+
+async def test_late_answer_as_message(application, fake_api):
+    handler = answer_inline_query_early(slow_delete, late_answer="message")
+
+    async def click(update: Update):
+        await handler(update, ApplicationContext.from_update(update, application))
+
+    await click(callback_update(application.bot))
+    assert fake_api.endpoint_params("sendMessage")[-1]["text"] == "Item deleted"
+
+    # Buttons of inline mode messages have no chat to send it to
+    await click(callback_update(application.bot, inline=True))
+    assert len(fake_api.endpoint_calls("sendMessage")) == 1
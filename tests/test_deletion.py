@@ -0,0 +1,60 @@
+import asyncio
+
+from structlog.testing import capture_logs
+
+from src.bot.common.context import ApplicationContext
+from src.bot.common.wrappers import command_handler, delete_message_after
+from tests.benchmarks.factories import command_update
+from tests.conftest import USER_ID
+
+
+async def test_deletions_are_batched_per_chat(application, fake_api):
+    queue = application.bot_data._deletion_queue
+    for message_id in range(250):
+        queue.delete(1, message_id)
+    queue.delete(2, 1)
+    queue.delete(2, 2, delay=0.05)
+    await asyncio.sleep(0.03)
+
+    batches = fake_api.endpoint_params("deleteMessages")
+    assert [(b["chat_id"], len(b["message_ids"])) for b in batches] == [
+        (1, 100),
+        (1, 100),
+        (1, 50),
+        (2, 1),
+    ]
+    await asyncio.sleep(0.05)
+    assert fake_api.endpoint_params("deleteMessages")[-1]["message_ids"] == [2]
+    assert not fake_api.endpoint_calls("deleteMessage")
+
+
+async def test_failed_deletions_are_not_warnings(application, fake_api):
+    queue = application.bot_data._deletion_queue
+    fake_api.fail("deleteMessages", "Bad Request: message can't be deleted")
+    queue.delete(1, 1)
+    queue.delete(2, 1)
+    with capture_logs() as logs:
+        await queue.shutdown()
+
+    # The failed chat doesn't stop the others
+    assert len(fake_api.endpoint_params("deleteMessages")) == 2
+    assert [(entry["log_level"], entry["event"]) for entry in logs] == [
+        ("info", "Failed deleting messages")
+    ]
+
+
+async def test_delete_message_after(application, fake_api):
+    @command_handler("clean")
+    @delete_message_after
+    async def clean(update, context: ApplicationContext):
+        pass
+
+    application.add_handler(clean)
+    updates = [command_update(application.bot, "/clean", user_id=USER_ID) for _ in range(3)]
+    for update in updates:
+        await application.process_update(update)
+    await application.bot_data._deletion_queue.shutdown()
+
+    batches = fake_api.endpoint_params("deleteMessages")
+    assert len(batches) == 1
+    assert batches[0]["message_ids"] == [u.effective_message.id for u in updates]
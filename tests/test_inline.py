@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import delete, select
+
+from src.bot import inline
+from src.bot.inline import inline_user_search, search_users
+from src.db.tables import User
+from tests.benchmarks.factories import inline_query_update
+from tests.conftest import USER_ID
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    inline._results = inline.TTLCache(max_entries=4096, ttl=inline.CACHE_TIME)
+    inline._registered = inline.TTLCache(max_entries=10_000, ttl=300)
+
+
+async def test_prefix_search(session_factory):
+    async with session_factory() as session:
+        session.add(User(telegram_id=1, is_bot=False, full_name="Alice Smith", telegram_username="alice_s"))
+        session.add(User(telegram_id=2, is_bot=False, full_name="Bob Smithers", telegram_username=None))
+        await session.commit()
+
+        names = lambda rows: [row.full_name for row in rows]
+        assert names(await search_users(session, "smi")) == ["Alice Smith", "Bob Smithers"]
+        assert names(await search_users(session, "ali SMI")) == ["Alice Smith"]
+        assert names(await search_users(session, "alice_s")) == ["Alice Smith"]
+        assert await search_users(session, "\"*") == []
+
+
+async def test_index_follows_updates_and_deletes(session_factory):
+    async with session_factory() as session:
+        user = await session.scalar(select(User).where(User.telegram_id == USER_ID))
+        user.full_name = "Renamed"
+        await session.commit()
+        assert [row.full_name for row in await search_users(session, "ren")] == ["Renamed"]
+        assert "User" not in [row.full_name for row in await search_users(session, "user")]
+
+        await session.execute(delete(User).where(User.telegram_id == USER_ID))
+        await session.commit()
+        assert await search_users(session, "ren") == []
+
+
+async def test_inline_query_pages(application, fake_api, session_factory):
+    async with session_factory() as session:
+        session.add_all(
+            User(telegram_id=10 + i, is_bot=False, full_name=f"Member {i}", telegram_username=None)
+            for i in range(inline.PAGE_SIZE + 5)
+        )
+        await session.commit()
+    application.add_handler(inline_user_search)
+
+    await application.process_update(inline_query_update(application.bot, "mem", user_id=USER_ID))
+    first = fake_api.endpoint_params("answerInlineQuery")[-1]
+    assert len(first["results"]) == inline.PAGE_SIZE
+    assert first["next_offset"]
+
+    await application.process_update(
+        inline_query_update(application.bot, "mem", user_id=USER_ID, offset=first["next_offset"])
+    )
+    second = fake_api.endpoint_params("answerInlineQuery")[-1]
+    assert len(second["results"]) == 5
+    assert second["next_offset"] == ""
+
+
+async def test_unregistered_users_get_no_results(application, fake_api):
+    application.add_handler(inline_user_search)
+    await application.process_update(inline_query_update(application.bot, "adm", user_id=999))
+    answer = fake_api.endpoint_params("answerInlineQuery")[-1]
+    assert answer["results"] == []
+    assert "start_parameter" in answer["button"]
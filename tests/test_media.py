@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import select
+from telegram.error import BadRequest
+
+from src.bot.common.media import MediaCache
+from src.db.tables import MediaFile
+from tests.conftest import USER_ID
+
+
+async def test_repeat_sends_reuse_file_id(application, fake_api, session_factory, tmp_path):
+    media = application.bot_data._media
+    image = tmp_path / "image.png"
+    image.write_bytes(b"\x89PNG" + bytes(100))
+
+    first = await media.send_photo(USER_ID, image)
+    second = await media.send_photo(USER_ID, image.read_bytes())
+    assert fake_api.uploads == 1
+    assert second.photo[-1].file_id == first.photo[-1].file_id
+
+    # Same bytes sent as a different kind need their own upload
+    await media.send_document(USER_ID, image)
+    assert fake_api.uploads == 2
+
+    # A fresh cache finds the file_id in the database
+    await MediaCache(application.bot, session_factory).send_photo(USER_ID, image)
+    assert fake_api.uploads == 2
+    async with session_factory() as session:
+        rows = (await session.scalars(select(MediaFile))).all()
+    assert {(row.kind, row.size) for row in rows} == {("photo", 104), ("document", 104)}
+
+
+async def test_only_stale_file_ids_are_forgotten(application, fake_api, session_factory):
+    media = application.bot_data._media
+    image = b"\x89PNG" + bytes(100)
+    await media.send_photo(USER_ID, image)
+
+    fake_api.fail("sendPhoto", "Bad Request: chat not found")
+    with pytest.raises(BadRequest, match="Chat not found"):
+        await media.send_photo(USER_ID, image)
+    assert fake_api.uploads == 1
+    async with session_factory() as session:
+        assert await session.scalar(select(MediaFile.file_id)) == "photo-1"
+
+    fake_api.fail("sendPhoto", "Bad Request: wrong file identifier/HTTP URL specified")
+    message = await media.send_photo(USER_ID, image)
+    assert fake_api.uploads == 2
+    assert message.photo[-1].file_id == "photo-2"
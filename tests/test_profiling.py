@@ -0,0 +1,100 @@
+import asyncio
+import time
+import tracemalloc
+
+from structlog.testing import capture_logs
+
+from src.bot.admin import memory, profile
+from src.bot.common.profiling import (
+    SamplingProfiler,
+    SlowUpdateLog,
+    allocation_diff,
+    deep_sizeof,
+)
+from tests.benchmarks.factories import command_update
+from tests.conftest import ADMIN_ID
+
+
+def busy_loop(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+async def test_profiler_samples_event_loop():
+    profiler = SamplingProfiler(interval=0.001)
+    profiling = asyncio.create_task(profiler.profile(0.2))
+    await asyncio.sleep(0)
+    busy_loop(0.2)
+    collapsed, samples = await profiling
+
+    assert samples > 10
+    busy = sum(int(line.rsplit(" ", 1)[1]) for line in collapsed.splitlines() if "busy_loop" in line)
+    assert busy / samples > 0.5
+    assert all(line.count(" (") == line.count(";") + 1 for line in collapsed.splitlines())
+
+
+async def test_allocation_diff():
+    leak = []
+
+    async def allocate():
+        await asyncio.sleep(0.01)
+        leak.extend(bytearray(1024) for _ in range(1000))
+
+    task = asyncio.create_task(allocate())
+    diff = await allocation_diff(0.05, top=3)
+    await task
+    assert diff[0].traceback[0].filename == __file__
+    assert diff[0].size_diff > 1000 * 1024
+    assert not tracemalloc.is_tracing()
+
+
+def test_deep_sizeof():
+    shared = bytearray(10_000)
+    assert deep_sizeof([shared]) > 10_000
+    assert deep_sizeof([shared], exclude=[shared]) < 1000
+    assert deep_sizeof({"a": [1, 2, 3]}) > deep_sizeof({})
+
+
+async def test_slow_update_log():
+    clock = [0.0]
+    processor = SlowUpdateLog(threshold=0.05, summary_interval=60, clock=lambda: clock[0])
+    with capture_logs() as logs:
+        await processor.process_update(object(), asyncio.sleep(0))
+        await processor.process_update(object(), asyncio.sleep(0.06))
+        await processor.process_update(object(), asyncio.sleep(0.06))
+        await processor.process_update(object(), asyncio.sleep(0.06))
+        clock[0] = 60
+        await processor.process_update(object(), asyncio.sleep(0.06))
+    assert processor.slow_updates == 4
+    assert [(entry["log_level"], entry["event"]) for entry in logs] == [
+        ("info", "Slow update"),
+        ("warning", "Slow updates"),
+        ("info", "Slow update"),
+        ("info", "Slow update"),
+        ("info", "Slow update"),
+        ("warning", "Slow updates"),
+    ]
+    # One warning per interval, counting the slow updates since the previous one
+    summaries = [entry for entry in logs if entry["log_level"] == "warning"]
+    assert [(entry["count"], entry["slowest"]) for entry in summaries] == [(1, "object"), (3, "object")]
+
+
+async def test_profile_and_memory_commands(application, fake_api):
+    application.add_handlers([profile, memory])
+
+    await application.process_update(command_update(application.bot, "/profile 0.1", user_id=ADMIN_ID))
+    await application.process_update(command_update(application.bot, "/memory 0.1", user_id=ADMIN_ID))
+    assert [p["text"] for p in fake_api.endpoint_params("sendMessage")] == [
+        "Profiling for 0.1s",
+        "Tracing allocations for 0.1s",
+    ]
+    while len(fake_api.endpoint_params("sendMessage")) < 3 or not fake_api.endpoint_calls("sendDocument"):
+        await asyncio.sleep(0.02)
+
+    assert "samples over 0.1s" in fake_api.endpoint_params("sendDocument")[0]["caption"]
+    report = fake_api.endpoint_params("sendMessage")[-1]["text"]
+    assert report.startswith("user_data: ") and "callback data cache: " in report
+
+    await application.process_update(command_update(application.bot, "/profile 1000", user_id=ADMIN_ID))
+    assert fake_api.endpoint_params("sendMessage")[-1]["text"].startswith("Usage: ")
@@ -0,0 +1,159 @@
+import asyncio
+from datetime import timedelta
+
+from sqlalchemy import select
+from telegram.ext import ConversationHandler
+
+from src.bot.common.context import ApplicationContext
+from src.bot.common.conversation import (
+    PTB_TIMEOUT_HOOKS,
+    ConversationBuilder,
+    WheelConversationHandler,
+)
+from src.bot.common.scheduler import JobScheduler
+from src.bot.common.timing_wheel import TimingWheel
+from src.bot.common.wrappers import any_message, command_handler
+from src.db.tables import ScheduledJob
+from tests.benchmarks.factories import command_update
+from tests.conftest import USER_ID
+
+
+async def test_run_due_jobs(application):
+    scheduler = JobScheduler(batch_size=2, max_attempts=2)
+    runs = []
+
+    @scheduler.job()
+    async def remember(context: ApplicationContext, data):
+        runs.append(data)
+
+    @scheduler.job()
+    async def fail(context: ApplicationContext, data):
+        raise RuntimeError("boom")
+
+    context = ApplicationContext(application)
+    async with context.session() as session:
+        for i in range(3):
+            await scheduler.schedule(session, "remember", timedelta(0), i)
+        await scheduler.schedule(session, "remember", timedelta(hours=1), "later")
+        await scheduler.schedule(session, "remember", timedelta(0), "again", interval=timedelta(minutes=1))
+        await scheduler.schedule(session, "fail", timedelta(0))
+        await session.commit()
+
+    await application.start()
+    try:
+        await scheduler.run_due(context)
+        await scheduler.wait()
+    finally:
+        await application.stop()
+    assert sorted(map(str, runs)) == ["0", "1", "2", "again"]
+
+    async with context.session() as session:
+        jobs = {job.data: job for job in await session.scalars(select(ScheduledJob))}
+    assert set(jobs) == {None, "later", "again"}
+    # Failed job keeps its lease and is retried once it runs out
+    assert jobs[None].attempts == 1
+    assert jobs["again"].attempts == 0
+
+
+async def test_slow_job_does_not_block_polls(application, caplog):
+    scheduler = JobScheduler(poll_interval=0.01)
+    finished = []
+    release = asyncio.Event()
+
+    @scheduler.job()
+    async def slow(context: ApplicationContext, data):
+        await release.wait()
+        finished.append(data)
+
+    @scheduler.job()
+    async def fast(context: ApplicationContext, data):
+        finished.append(data)
+
+    context = ApplicationContext(application)
+    async with context.session() as session:
+        await scheduler.schedule(session, "slow", timedelta(0), "slow")
+        await session.commit()
+    await application.start()
+    try:
+        scheduler.start(application)
+        await asyncio.sleep(0.1)
+        async with context.session() as session:
+            await scheduler.schedule(session, "fast", timedelta(0), "fast")
+            await session.commit()
+        await asyncio.sleep(0.1)
+        # Polls go on while the slow job runs, its lease keeps them from claiming it again
+        assert finished == ["fast"]
+    finally:
+        release.set()
+        await scheduler.wait()
+        await application.stop()
+
+    assert finished == ["fast", "slow"]
+    async with context.session() as session:
+        assert list(await session.scalars(select(ScheduledJob))) == []
+    # APScheduler skips polls that overlap the previous one with a warning
+    assert not [r for r in caplog.records if "maximum number of running instances" in r.getMessage()]
+
+
+def test_timing_wheel():
+    now = [0.0]
+    wheel = TimingWheel(resolution=1, slots=4, clock=lambda: now[0])
+    short = wheel.schedule(2, "short")
+    cancelled = wheel.schedule(2, "cancelled")
+    # Longer than one revolution of the wheel
+    long = wheel.schedule(9, "long")
+    cancelled.schedule_removal()
+    assert len(wheel) == 2
+
+    now[0] = 1
+    assert wheel.expire() == []
+    now[0] = 5
+    assert wheel.expire() == [short]
+    now[0] = 20
+    assert wheel.expire() == [long]
+    assert len(wheel) == 0
+
+
+async def test_conversation_timeout_on_wheel(application):
+    builder = ConversationBuilder(conversation_timeout=0.05, timeout_resolution=0.01)
+    timed_out = []
+
+    @builder.entry_point
+    @command_handler("enter")
+    async def enter(update, context):
+        return 1
+
+    @builder.state(1)
+    @any_message
+    async def waiting(update, context):
+        return 1
+
+    @builder.state(ConversationHandler.TIMEOUT)
+    @any_message
+    async def timeout(update, context):
+        timed_out.append(update)
+
+    handler = builder.build()
+    assert isinstance(handler, WheelConversationHandler)
+    application.add_handler(handler)
+    await application.start()
+    try:
+        assert handler._tick_job is None
+        await application.process_update(command_update(application.bot, "/enter", user_id=USER_ID))
+        assert len(handler.wheel) == 1
+        assert handler._ticking
+        await asyncio.sleep(0.3)
+        # Nothing pending, the tick job is paused until the next conversation starts
+        assert not handler._ticking and handler._tick_job.job.next_run_time is None
+        await application.process_update(command_update(application.bot, "/enter", user_id=USER_ID))
+        assert handler._ticking and handler._tick_job.job.next_run_time is not None
+        await asyncio.sleep(0.3)
+    finally:
+        await application.stop()
+    assert len(timed_out) == 2
+    assert not handler.timeout_jobs
+
+
+def test_ptb_has_conversation_timeout_hooks():
+    # Fails after a python-telegram-bot upgrade that changes the private hooks
+    assert PTB_TIMEOUT_HOOKS
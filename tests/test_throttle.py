@@ -0,0 +1,81 @@
+import pytest
+from telegram.ext import ApplicationHandlerStop
+
+from src.bot.common.throttle import FloodControl
+from tests.benchmarks.factories import command_update, inline_query_update
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_burst_then_drop_then_refill():
+    clock = Clock()
+    throttle = FloodControl(rate=1, burst=3, notice=None, clock=clock)
+    update = command_update(None, "/start", user_id=1)  # type: ignore
+    for _ in range(3):
+        assert throttle.check_update(update) is None
+    with pytest.raises(ApplicationHandlerStop):
+        throttle.check_update(update)
+    clock.now += 1
+    assert throttle.check_update(update) is None
+    assert throttle.stats.allowed == 4
+    assert throttle.stats.dropped_by_command["start"] == 1
+
+
+def test_command_costs_and_notice_rate_limit():
+    clock = Clock()
+    throttle = FloodControl(rate=1, burst=4, costs={"role": 3}, notice_interval=10, clock=clock)
+    update = command_update(None, "/role@benchmark_bot 1 admin", user_id=1)  # type: ignore
+    assert throttle.check_update(update) is None
+    # First throttled update gets a notice, the following ones are dropped silently
+    assert throttle.check_update(update) is True
+    with pytest.raises(ApplicationHandlerStop):
+        throttle.check_update(update)
+    clock.now += 10
+    assert throttle.check_update(update) is None
+    assert throttle.check_update(update) is True
+
+
+def test_buckets_are_per_user_and_evicted():
+    throttle = FloodControl(rate=1, burst=1, notice=None, max_keys=2, clock=Clock())
+    updates = [command_update(None, "/start", user_id=i) for i in range(3)]  # type: ignore
+    for update in updates:
+        assert throttle.check_update(update) is None
+    assert throttle.stats.evicted == 1
+    # The first user got evicted, so it starts with a full bucket again
+    assert throttle.check_update(updates[0]) is None
+    with pytest.raises(ApplicationHandlerStop):
+        throttle.check_update(updates[2])
+
+
+def test_bare_slash_is_a_plain_message():
+    throttle = FloodControl(rate=1, burst=2, notice=None, clock=Clock())
+    for text in ["/", "/ foo"]:
+        assert throttle.check_update(command_update(None, text, user_id=1)) is None  # type: ignore
+    with pytest.raises(ApplicationHandlerStop):
+        throttle.check_update(command_update(None, "/", user_id=1))  # type: ignore
+    assert throttle.stats.dropped_by_command["message"] == 1
+
+
+async def test_inline_queries_have_their_own_cost(application, fake_api):
+    throttle = FloodControl(rate=1, burst=1, inline_query_cost=0.1, clock=Clock())
+    application.add_handler(throttle, group=-1)
+    # One query per keystroke, typing a name takes a fraction of the bucket
+    for i in range(1, 6):
+        update = inline_query_update(application.bot, "alice"[:i], user_id=1)
+        assert throttle.check_update(update) is None
+    assert throttle.check_update(command_update(None, "/start", user_id=1)) is True  # type: ignore
+
+    # Throttled inline queries are always answered with no results instead of a notice
+    for _ in range(7):
+        await application.process_update(inline_query_update(application.bot, "bob", user_id=1))
+    answers = fake_api.endpoint_params("answerInlineQuery")
+    assert len(answers) == 2
+    assert all(a["results"] == [] for a in answers)
+    assert throttle.stats.dropped_by_command["inline_query"] == 2
+    assert throttle.stats.notices == 0